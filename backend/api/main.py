@@ -2,12 +2,14 @@
 FastAPI application for Name Pronunciation Analyser.
 """
 
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
 import os
+import secrets
 import sys
 import logging
 from pathlib import Path
@@ -19,7 +21,14 @@ from slowapi.errors import RateLimitExceeded
 # Add parent directory to path to import services
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from services import LanguageDetector, AnalysisService
+from services import (
+    LanguageDetector, AnalysisService, LLMCassette, LLMScheduler, UsageTracker, PRIORITY_BATCH, PRIORITY_INTERACTIVE
+)
+from services.analysis_service import AnalysisOutput
+from services.exporter import EXPORT_FORMATS, csv_export, html_export, jsonl_export, ordered_rows
+from services.profiler import ProfilingMiddleware, RequestProfiler, mark_phase
+from services.reading_session import CursorRateLimited, ReadingSession, ReadingSessionManager
+from services.serialisation import PayloadCache, dumps_json
 
 # Load environment variables
 load_dotenv()
@@ -57,14 +66,73 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Profile-Id"],
 )
 
 # Initialise services
 language_detector = LanguageDetector()
-analysis_service = AnalysisService(language_detector)
+llm_scheduler = LLMScheduler()
+llm_cassette = LLMCassette()
+llm_usage = UsageTracker()
+analysis_service = AnalysisService(language_detector, scheduler=llm_scheduler, cassette=llm_cassette, usage=llm_usage)
+response_payloads = PayloadCache()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop background work and persist cached results and recordings."""
+    await reading_sessions.close_all()
+    await analysis_service.revalidator.close()
+    analysis_service.cache.save()
+    llm_cassette.flush()
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    import hmac
+
+    expected = os.getenv("ADMIN_API_TOKEN")
+    return bool(expected and token and hmac.compare_digest(token, expected))
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    """Guard for operational endpoints; disabled unless ADMIN_API_TOKEN is set."""
+    if not os.getenv("ADMIN_API_TOKEN"):
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+# Opt-in request profiling (X-Profile: 1 with an admin token, or PROFILE_SAMPLE_RATE)
+request_profiler = RequestProfiler(is_admin=is_admin_token)
+app.add_middleware(ProfilingMiddleware, profiler=request_profiler, path_prefix="/api/analyse")
 
 
 # Request/Response models
+def clean_name(v: str) -> str:
+    """Trim, NFC-normalise and sanity-check a submitted name."""
+    import unicodedata
+    # Trim whitespace
+    v = v.strip()
+    if not v:
+        raise ValueError('Name cannot be empty or only whitespace')
+
+    # Normalize to NFC (Canonical Composition) for consistent character representation
+    # This ensures combining marks are composed with their base characters
+    v = unicodedata.normalize('NFC', v)
+
+    # Count only truly problematic characters (control chars, etc.)
+    # Allow letters from any script, numbers, spaces, common name punctuation, and combining marks
+    problematic_count = 0
+    for c in v:
+        cat = unicodedata.category(c)
+        # Allow: Letters (L*), Numbers (N*), Spaces (Z*), Marks (M*), common punctuation
+        if cat[0] not in ('L', 'N', 'Z', 'M') and c not in '-\'.,':
+            problematic_count += 1
+    if problematic_count > len(v) * 0.3:  # More than 30% problematic chars
+        raise ValueError('Name contains too many special characters')
+    return v
+
+
 class NameAnalysisRequest(BaseModel):
     name: str = Field(
         ...,
@@ -76,27 +144,7 @@ class NameAnalysisRequest(BaseModel):
     @field_validator('name')
     @classmethod
     def validate_name(cls, v: str) -> str:
-        import unicodedata
-        # Trim whitespace
-        v = v.strip()
-        if not v:
-            raise ValueError('Name cannot be empty or only whitespace')
-
-        # Normalize to NFC (Canonical Composition) for consistent character representation
-        # This ensures combining marks are composed with their base characters
-        v = unicodedata.normalize('NFC', v)
-
-        # Count only truly problematic characters (control chars, etc.)
-        # Allow letters from any script, numbers, spaces, common name punctuation, and combining marks
-        problematic_count = 0
-        for c in v:
-            cat = unicodedata.category(c)
-            # Allow: Letters (L*), Numbers (N*), Spaces (Z*), Marks (M*), common punctuation
-            if cat[0] not in ('L', 'N', 'Z', 'M') and c not in '-\'.,':
-                problematic_count += 1
-        if problematic_count > len(v) * 0.3:  # More than 30% problematic chars
-            raise ValueError('Name contains too many special characters')
-        return v
+        return clean_name(v)
 
     class Config:
         json_schema_extra = {
@@ -261,6 +309,66 @@ async def send_alert(payload: dict):
         logger.error(f"Error sending alert: {str(e)}")
 
 
+def analysis_payload(name: str, analysis: AnalysisOutput) -> Dict[str, Any]:
+    """Response body for an analysis, with the same fields as NameAnalysisResponse."""
+    # Use model-inferred language if available, otherwise fall back to script detection
+    inferred_language = analysis.inferred_language or language_detector.detect(name)[0]
+
+    return {
+        "name": analysis.name_with_diacritics or name,  # Show name with diacritics
+        "language": inferred_language,  # Use Claude's inference
+        "ipa": analysis.ipa,
+        "macquarie": analysis.macquarie,
+        "pronunciation_guidance": analysis.guidance,
+        "confidence": analysis.confidence,
+        "quality": analysis.quality,
+        "source": analysis.source,
+        "language_info": language_detector.get_language_info(inferred_language),
+        "romanization_system": None,
+        "tone_marks_added": False,
+        "ambiguity": analysis.ambiguity,
+        "cultural_notes": analysis.cultural_notes,
+    }
+
+
+async def build_analysis_body(
+    name: str,
+    priority: str = PRIORITY_INTERACTIVE,
+    batch_id: Optional[str] = None,
+    endpoint: Optional[str] = None
+) -> Tuple[bytes, str, str]:
+    """
+    Run the analysis pipeline for an already validated name.
+
+    Cache hits are answered from pre-serialised payloads, so a repeat lookup
+    skips model construction and JSON encoding and is written out as bytes.
+
+    Args:
+        name: Validated, NFC-normalised name
+        priority: LLM scheduler priority class for any upstream calls
+        batch_id: Batch the lookup belongs to, for fair sharing between batches
+        endpoint: Caller label for token usage accounting
+
+    Returns:
+        Tuple of (JSON response body, result quality, analysis version that produced it)
+    """
+    mark_phase("cache")
+    entry = analysis_service.lookup(name)
+    if entry is not None:
+        key = (name, entry.version, entry.stored_at)
+        body = response_payloads.get(key)
+        if body is None:
+            analysis = analysis_service.output_from_entry(entry, name)
+            body = dumps_json(analysis_payload(name, analysis))
+            response_payloads.put(key, body)
+        return body, entry.output.get("quality", "high"), entry.version
+
+    # Analyse pronunciation using LLM-backed pipeline
+    analysis = await analysis_service.analyse_uncached(name, priority, batch_id, endpoint)
+    mark_phase("serialisation")
+    return dumps_json(analysis_payload(name, analysis)), analysis.quality, analysis_service.analysis_version
+
+
 @app.post("/api/analyse", response_model=NameAnalysisResponse)
 @limiter.limit("10/minute")  # 10 requests per minute per IP
 async def analyse_name(request: Request, name_request: NameAnalysisRequest):
@@ -282,54 +390,464 @@ async def analyse_name(request: Request, name_request: NameAnalysisRequest):
 
         logger.info(f"Analyzing name: {name[:50]}")
 
-        # Detect script (for rare cases with Chinese characters, etc.)
-        script_language, script_confidence = language_detector.detect(name)
+        body, quality, _ = await build_analysis_body(name, endpoint="POST /api/analyse")
 
-        # Analyse pronunciation using LLM-backed pipeline
-        analysis = await analysis_service.analyse(name)
+        logger.info(f"Successfully analyzed: {name[:50]} ({quality})")
 
-        # Use model-inferred language if available, otherwise fall back to script detection
-        inferred_language = analysis.inferred_language or script_language
+        return Response(content=body, media_type="application/json")
 
-        # Get language information based on inferred language
-        language_info = language_detector.get_language_info(inferred_language)
+    except HTTPException:
+        raise
+    except Exception as e:
+        # Log full error internally
+        logger.error(f"Error analyzing name '{name[:50]}': {str(e)}", exc_info=True)
 
-        # Use name_with_diacritics if provided by Claude, otherwise use original
-        display_name = analysis.name_with_diacritics or name
+        # Return generic message to client
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while analyzing the name. Please try again."
+        )
 
-        logger.info(f"Successfully analyzed: {name[:50]} -> {inferred_language}")
 
-        cultural_notes = analysis.cultural_notes
+# Cache-Control policy for GET /api/analyse by result quality
+CACHE_CONTROL_POLICIES = {
+    "high": os.getenv("CACHE_CONTROL_HIGH", "public, max-age=86400, stale-while-revalidate=604800"),
+    "medium": os.getenv("CACHE_CONTROL_MEDIUM", "public, max-age=3600"),
+    "fallback": os.getenv("CACHE_CONTROL_FALLBACK", "public, max-age=60"),
+    # Results from an older model or prompt, served while they are re-analysed
+    "stale": os.getenv("CACHE_CONTROL_STALE", "public, max-age=60"),
+}
 
-        return NameAnalysisResponse(
-            name=display_name,  # Show name with diacritics
-            language=inferred_language,  # Use Claude's inference
-            ipa=analysis.ipa,
-            macquarie=analysis.macquarie,
-            pronunciation_guidance=analysis.guidance,
-            confidence=analysis.confidence,
-            quality=analysis.quality,
-            source=analysis.source,
-            language_info=language_info,
-            romanization_system=None,
-            tone_marks_added=False,
-            ambiguity=analysis.ambiguity,
-            cultural_notes=analysis.cultural_notes
-        )
+
+def response_etag(body: bytes, version: str) -> str:
+    """Strong ETag over the serialised result and the analysis version that produced it."""
+    import hashlib
+
+    digest = hashlib.sha256(version.encode("utf-8") + b"\0" + body)
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+@app.get("/api/analyse", response_model=NameAnalysisResponse)
+@limiter.limit("10/minute")  # 10 requests per minute per IP
+async def analyse_name_cacheable(
+    request: Request,
+    name: str = Query(..., min_length=1, max_length=200, description="Name to analyze")
+):
+    """
+    Cacheable variant of POST /api/analyse for browsers and CDNs.
+
+    Responses carry a strong ETag and a Cache-Control policy chosen by result
+    quality; a matching If-None-Match returns 304 with no body.
+    """
+    try:
+        # Collapse internal whitespace so variants share one representation and ETag
+        name = " ".join(clean_name(name).split())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    try:
+        logger.info(f"Analyzing name: {name[:50]}")
+
+        body, quality, version = await build_analysis_body(name, endpoint="GET /api/analyse")
+
+        # A stale result is replaced once revalidation finishes; keep caches from holding it.
+        policy = "stale" if version != analysis_service.analysis_version else quality
+        headers = {
+            "ETag": response_etag(body, version),
+            "Cache-Control": CACHE_CONTROL_POLICIES.get(policy, CACHE_CONTROL_POLICIES["fallback"]),
+        }
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+        logger.info(f"Successfully analyzed: {name[:50]} ({quality})")
+
+        return Response(content=body, media_type="application/json", headers=headers)
 
     except HTTPException:
         raise
     except Exception as e:
-        # Log full error internally
         logger.error(f"Error analyzing name '{name[:50]}': {str(e)}", exc_info=True)
 
-        # Return generic message to client
         raise HTTPException(
             status_code=500,
             detail="An error occurred while analyzing the name. Please try again."
         )
 
 
+# Ceremony live-reading sessions
+class ReadingSessionRequest(BaseModel):
+    names: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=5000,
+        description="Roster in reading order"
+    )
+    lookahead: Optional[int] = Field(
+        default=None,
+        ge=0,
+        le=50,
+        description="Number of names to keep prefetched ahead of the cursor"
+    )
+
+    @field_validator('names')
+    @classmethod
+    def validate_names(cls, v: List[str]) -> List[str]:
+        cleaned = []
+        for name in v:
+            if len(name) > 200:
+                raise ValueError('Name exceeds 200 characters')
+            cleaned.append(clean_name(name))
+        return cleaned
+
+
+class CursorMoveRequest(BaseModel):
+    step: Optional[int] = Field(default=None, description="Relative move, e.g. 1 for next, -1 for previous")
+    index: Optional[int] = Field(default=None, ge=0, description="Absolute roster position")
+
+
+async def resolve_session_name(name: str, priority: str, batch_id: Optional[str]) -> Dict[str, Any]:
+    analysis = await analysis_service.analyse(name, priority=priority, batch_id=batch_id, endpoint="/api/sessions")
+    payload = analysis_payload(name, analysis)
+    payload["language_info"] = dict(payload["language_info"])
+    return payload
+
+
+reading_sessions = ReadingSessionManager(resolve_session_name)
+
+
+def get_reading_session(session_id: str) -> ReadingSession:
+    session = reading_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Reading session not found")
+    return session
+
+
+def reading_session_state(session: ReadingSession) -> Dict[str, Any]:
+    ready = session.ready()
+    return {
+        **session.snapshot(),
+        "current": ready.get(session.cursor),
+        "results": [{"index": index, "result": result} for index, result in sorted(ready.items())],
+    }
+
+
+@app.post("/api/sessions", status_code=201, dependencies=[Depends(require_admin)])
+@limiter.limit("5/minute")
+async def create_reading_session(request: Request, session_request: ReadingSessionRequest):
+    """
+    Start a live-reading session for an ordered ceremony roster.
+
+    The current name and the next `lookahead` names are prefetched and pinned
+    in memory so that advancing the cursor does not wait on the LLM. Every
+    cursor move can analyse up to `lookahead` new names, so creating a session
+    requires the admin token; the returned session id is then enough to drive it.
+    """
+    try:
+        session = await reading_sessions.create(session_request.names, session_request.lookahead)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return reading_session_state(session)
+
+
+@app.get("/api/sessions/{session_id}")
+async def get_reading_session_state(session_id: str):
+    """Current cursor position and the prefetched results held by the session."""
+    return reading_session_state(get_reading_session(session_id))
+
+
+@app.post("/api/sessions/{session_id}/cursor")
+async def move_reading_session_cursor(session_id: str, move: CursorMoveRequest):
+    """Move to another graduate and return their result, waiting only if it is not yet prefetched."""
+    session = get_reading_session(session_id)
+    try:
+        if move.index is not None:
+            session.move(move.index)
+        else:
+            session.advance(move.step if move.step is not None else 1)
+    except CursorRateLimited as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    await session.current()
+    return reading_session_state(session)
+
+
+@app.delete("/api/sessions/{session_id}", status_code=204)
+async def close_reading_session(session_id: str):
+    """End a reading session and release its pinned results."""
+    if not await reading_sessions.close(session_id):
+        raise HTTPException(status_code=404, detail="Reading session not found")
+
+
+@app.websocket("/api/sessions/{session_id}/ws")
+async def reading_session_socket(websocket: WebSocket, session_id: str):
+    """
+    Push channel for a reading session.
+
+    On connect the full session state is sent, followed by a `result` event
+    whenever a prefetch completes and a `cursor` event whenever the cursor
+    moves. Clients move the cursor by sending `{"action": "advance", "step": 1}`
+    or `{"action": "seek", "index": 42}`.
+    """
+    session = reading_sessions.get(session_id)
+    if session is None:
+        await websocket.close(code=4404)
+        return
+
+    await websocket.accept()
+    events = session.subscribe()
+
+    async def push_events():
+        while True:
+            event = await events.get()
+            await websocket.send_json(event)
+            if event.get("type") == "closed":
+                return
+
+    async def receive_commands():
+        while True:
+            message = await websocket.receive_json()
+            action = message.get("action") if isinstance(message, dict) else None
+            try:
+                if action == "advance":
+                    session.advance(int(message.get("step", 1)))
+                elif action == "seek":
+                    session.move(int(message.get("index", 0)))
+                else:
+                    await websocket.send_json({"type": "error", "detail": f"Unknown action: {action}"})
+            except (TypeError, ValueError):
+                await websocket.send_json({"type": "error", "detail": "Invalid cursor position"})
+            except CursorRateLimited as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+
+    try:
+        await websocket.send_json({"type": "state", **reading_session_state(session)})
+        tasks = [asyncio.create_task(push_events()), asyncio.create_task(receive_commands())]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            if task.exception() and not isinstance(task.exception(), WebSocketDisconnect):
+                logger.warning(f"Reading session socket error: {task.exception()}")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        session.unsubscribe(events)
+
+
+# Streaming roster exports
+EXPORT_LOOKAHEAD = int(os.getenv("EXPORT_LOOKAHEAD", "8"))
+
+
+class ExportRequest(BaseModel):
+    names: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=20000,
+        description="Roster in reading order"
+    )
+    title: str = Field(default="Reader sheet", max_length=200, description="Heading for the printable sheet")
+    analyse_missing: bool = Field(
+        default=False,
+        description="Analyse names without a cached result (batch priority, admin only) instead of leaving them pending"
+    )
+
+    @field_validator('names')
+    @classmethod
+    def validate_names(cls, v: List[str]) -> List[str]:
+        cleaned = []
+        for name in v:
+            if len(name) > 200:
+                raise ValueError('Name exceeds 200 characters')
+            cleaned.append(" ".join(clean_name(name).split()))
+        return cleaned
+
+
+def cached_export_row(index: int, name: str) -> Optional[Dict[str, Any]]:
+    entry = analysis_service.lookup(name)
+    if entry is None:
+        return None
+    return analysis_payload(name, analysis_service.output_from_entry(entry, name))
+
+
+def export_analyser(batch_id: str, endpoint: str):
+    async def analyse(index: int, name: str) -> Dict[str, Any]:
+        analysis = await analysis_service.analyse_uncached(name, PRIORITY_BATCH, batch_id, endpoint)
+        return analysis_payload(name, analysis)
+    return analyse
+
+
+def export_response(export_format: str, names: List[str], rows, title: str, filename: str) -> StreamingResponse:
+    """Stream rows in the requested format; the header is sent before any row is resolved."""
+    if export_format == "csv":
+        body = csv_export(rows)
+    elif export_format == "jsonl":
+        body = jsonl_export(rows)
+    else:
+        body = html_export(rows, title, len(names))
+
+    media_type, extension = EXPORT_FORMATS[export_format]
+    disposition = "inline" if export_format == "html" else "attachment"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'{disposition}; filename="{filename}.{extension}"'}
+    )
+
+
+def validate_export_format(export_format: str) -> None:
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=404, detail=f"Unknown export format: {export_format}")
+
+
+@app.post("/api/exports/{export_format}")
+@limiter.limit("5/minute")
+async def export_roster(
+    request: Request,
+    export_format: str,
+    export_request: ExportRequest,
+    x_admin_token: Optional[str] = Header(default=None)
+):
+    """
+    Stream an ordered roster as CSV, JSON Lines or a printable HTML reader sheet.
+
+    Rows come from the result cache in roster order. Names without a cached
+    result are marked pending, or analysed a few rows ahead of the stream at
+    batch priority when `analyse_missing` is set; that spends LLM tokens for
+    every missing name, so it requires the admin token. Memory use does not
+    grow with the roster.
+    """
+    validate_export_format(export_format)
+    if export_request.analyse_missing:
+        await require_admin(x_admin_token)
+    names = export_request.names
+    analyse = export_analyser(f"export-{secrets.token_hex(4)}", "/api/exports") if export_request.analyse_missing else None
+    rows = ordered_rows(names, cached_export_row, analyse, window=EXPORT_LOOKAHEAD)
+    logger.info(f"Exporting {len(names)} names as {export_format}")
+    return export_response(export_format, names, rows, export_request.title, "roster")
+
+
+@app.get("/api/sessions/{session_id}/export/{export_format}")
+@limiter.limit("5/minute")
+async def export_reading_session(
+    request: Request,
+    session_id: str,
+    export_format: str,
+    analyse_missing: bool = Query(default=False, description="Analyse names without a result at batch priority (admin only)"),
+    x_admin_token: Optional[str] = Header(default=None)
+):
+    """Stream a reading session's roster with its prefetched results, falling back to the result cache."""
+    validate_export_format(export_format)
+    if analyse_missing:
+        await require_admin(x_admin_token)
+    session = get_reading_session(session_id)
+
+    def session_row(index: int, name: str) -> Optional[Dict[str, Any]]:
+        result = session.result(index)
+        return result if result is not None else cached_export_row(index, name)
+
+    analyse = export_analyser(session.job_id, "/api/sessions/export") if analyse_missing else None
+    rows = ordered_rows(session.names, session_row, analyse, window=EXPORT_LOOKAHEAD)
+    return export_response(export_format, session.names, rows, "Reader sheet", f"session-{session.id}")
+
+
+@app.get("/api/metrics")
+async def metrics(x_admin_token: Optional[str] = Header(default=None)):
+    """
+    Runtime metrics for capacity planning.
+
+    Reports LLM scheduler queue depth, active slots and wait-time
+    percentiles per priority class, plus result cache, negative cache and
+    revalidation state and total LLM token counts. Costs and the per-job
+    queue breakdown are only available with the admin token (see /api/usage).
+    """
+    scheduler = llm_scheduler.stats()
+    if not is_admin_token(x_admin_token):
+        del scheduler["batches"]
+    return {
+        "scheduler": scheduler,
+        "cache": analysis_service.cache.stats(analysis_service.analysis_version),
+        "negative_cache": analysis_service.negative_cache.stats(),
+        "revalidation": analysis_service.revalidator.progress(),
+        "cassette": llm_cassette.stats(),
+        "reading_sessions": reading_sessions.stats(),
+        "usage": {key: value for key, value in llm_usage.total.as_dict().items() if "cost" not in key},
+    }
+
+
+@app.get("/api/usage", dependencies=[Depends(require_admin)])
+async def token_usage():
+    """
+    LLM token usage and estimated cost per model, endpoint and job.
+
+    Wasted figures count attempts whose output failed the quality gate or
+    errored; `budgets` shows configured token budgets and how often they
+    stopped retries.
+    """
+    return llm_usage.stats()
+
+
+@app.get("/api/cache/failures", dependencies=[Depends(require_admin)])
+async def cache_failures():
+    """Names currently short-circuited to fallback output after repeated failures."""
+    return {
+        "failures": analysis_service.negative_cache.report(),
+    }
+
+
+@app.get("/api/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """Recorded request profiles, newest first, with per-phase wall and CPU time."""
+    return {
+        "profiles": request_profiler.list(),
+    }
+
+
+@app.get("/api/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def download_profile(profile_id: str, format: str = Query(default="folded", pattern="^(folded|json)$")):
+    """
+    Download a recorded profile.
+
+    `folded` stacks load directly into speedscope or flamegraph.pl; `json`
+    holds the phase timings.
+    """
+    path = request_profiler.path_for(profile_id, format)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    media_type = "application/json" if format == "json" else "text/plain"
+    return FileResponse(path, media_type=media_type, filename=path.name)
+
+
+@app.post("/api/cache/revalidate", dependencies=[Depends(require_admin)])
+async def revalidate_cache():
+    """
+    Queue every cached result produced by an older model or prompt version.
+
+    Stale results continue to be served until their refresh completes.
+    """
+    queued = analysis_service.revalidator.enqueue_stale()
+    logger.info(f"Queued {queued} stale results for revalidation")
+    return {
+        "queued": queued,
+        "analysis_version": analysis_service.analysis_version,
+        "progress": analysis_service.revalidator.progress(),
+    }
+
+
+@app.get("/api/cache/revalidate", dependencies=[Depends(require_admin)])
+async def revalidation_progress():
+    """Progress of background revalidation."""
+    return {
+        "analysis_version": analysis_service.analysis_version,
+        "progress": analysis_service.revalidator.progress(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
 
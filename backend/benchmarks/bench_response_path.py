@@ -0,0 +1,154 @@
+"""
+Benchmark: cache-hit response serialisation, legacy path vs fast path.
+
+The legacy path reproduces the original /api/analyse handler: it rebuilds the
+language info dict on every call, constructs a validated NameAnalysisResponse
+and lets FastAPI encode it. The fast path is the current handler, which
+answers cache hits with pre-serialised bytes.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_response_path --requests 5000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+os.environ.pop("OPENAI_API_KEY", None)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+
+import logging
+logging.disable(logging.CRITICAL)
+
+import httpx
+from fastapi import Request
+
+import main
+from main import NameAnalysisRequest, NameAnalysisResponse, analysis_service, language_detector
+from services.analysis_service import AnalysisOutput
+from services.language_detector import DEFAULT_LANGUAGE_INFO, LANGUAGE_INFO
+
+SAMPLE_NAMES = [
+    "Zhang Wei", "Nguyễn Thị Hương", "Priya Raghunathan", "Kim Min-jun", "Siobhán O'Sullivan",
+    "Oluwaseun Adebayo", "Mohammed Al-Rashid", "Sakura Tanaka", "Aroha Ngata", "Łukasz Wiśniewski",
+]
+
+
+def legacy_language_info(language: str) -> dict:
+    # The original implementation built the whole table on every call.
+    info = {lang: dict(entry) for lang, entry in LANGUAGE_INFO.items()}
+    return info.get(language, dict(DEFAULT_LANGUAGE_INFO))
+
+
+@main.app.post("/bench/legacy-analyse", response_model=NameAnalysisResponse)
+async def legacy_analyse(request: Request, name_request: NameAnalysisRequest):
+    name = name_request.name.strip()
+    script_language, _ = language_detector.detect(name)
+    analysis = await analysis_service.analyse(name)
+    inferred_language = analysis.inferred_language or script_language
+    return NameAnalysisResponse(
+        name=analysis.name_with_diacritics or name,
+        language=inferred_language,
+        ipa=analysis.ipa,
+        macquarie=analysis.macquarie,
+        pronunciation_guidance=analysis.guidance,
+        confidence=analysis.confidence,
+        quality=analysis.quality,
+        source=analysis.source,
+        language_info=legacy_language_info(inferred_language),
+        romanization_system=None,
+        tone_marks_added=False,
+        ambiguity=analysis.ambiguity,
+        cultural_notes=analysis.cultural_notes
+    )
+
+
+def warm_cache() -> None:
+    for name in SAMPLE_NAMES:
+        output = AnalysisOutput(
+            name_with_diacritics=name,
+            inferred_language="Chinese",
+            ipa="/ʈʂɑŋ weɪ̯/",
+            macquarie="jahng way",
+            guidance="First tone on 'Zhang', third tone on 'Wei'.",
+            confidence=0.95,
+            ambiguity=None,
+            cultural_notes="Family name first.",
+            quality="high",
+            source="llm-primary"
+        )
+        analysis_service.cache.put(analysis_service.cache_key(name), name, asdict(output), analysis_service.analysis_version)
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            response = await client.post(path, json={"name": SAMPLE_NAMES[i % len(SAMPLE_NAMES)]})
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+async def run(requests: int, concurrency: int) -> None:
+    main.limiter.enabled = False
+    warm_cache()
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        legacy = (await client.post("/bench/legacy-analyse", json={"name": SAMPLE_NAMES[1]})).json()
+        fast = (await client.post("/api/analyse", json={"name": SAMPLE_NAMES[1]})).json()
+        assert legacy == fast, "fast path must return the same payload as the legacy path"
+
+        # Warm up both routes before timing.
+        await measure(client, "/bench/legacy-analyse", 200, concurrency)
+        await measure(client, "/api/analyse", 200, concurrency)
+
+        legacy_rps = await measure(client, "/bench/legacy-analyse", requests, concurrency)
+        fast_rps = await measure(client, "/api/analyse", requests, concurrency)
+
+    print(f"requests={requests} concurrency={concurrency} (in-process ASGI, cache hits)")
+    print(f"legacy path: {legacy_rps:8.0f} req/s")
+    print(f"fast path:   {fast_rps:8.0f} req/s  ({fast_rps / legacy_rps:.2f}x)")
+
+    # Serialisation alone, without the HTTP stack.
+    iterations = 20000
+    name = SAMPLE_NAMES[0]
+    entry = analysis_service.lookup(name)
+    analysis = analysis_service.output_from_entry(entry, name)
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        NameAnalysisResponse(
+            name=name, language=analysis.inferred_language, ipa=analysis.ipa, macquarie=analysis.macquarie,
+            pronunciation_guidance=analysis.guidance, confidence=analysis.confidence, quality=analysis.quality,
+            source=analysis.source, language_info=legacy_language_info(analysis.inferred_language),
+            ambiguity=analysis.ambiguity, cultural_notes=analysis.cultural_notes
+        ).model_dump_json()
+    legacy_us = (time.perf_counter() - started) / iterations * 1e6
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await main.build_analysis_body(name)
+    fast_us = (time.perf_counter() - started) / iterations * 1e6
+
+    print(f"serialise only: legacy {legacy_us:.1f} us/op, fast {fast_us:.1f} us/op")
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description="Compare legacy and fast /api/analyse response paths.")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,165 @@
+"""
+Precompute a ceremony roster into a read-only warm cache artifact.
+
+Reads names from a CSV roster, analyses each one at batch priority with
+bounded concurrency, and writes an artifact the API loads at startup via
+WARM_CACHE_ARTIFACT. Progress is checkpointed after every name so an
+interrupted run resumes where it stopped; names that fell back to the
+heuristic output are retried on resume and listed in a CSV report for review.
+LLM_JOB_TOKEN_BUDGET caps the tokens a single run may spend.
+
+Usage (from the backend directory):
+    python -m cli.precompute_roster roster.csv --output warm_cache.json --column "Full name"
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+import unicodedata
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import AnalysisService, LanguageDetector, PRIORITY_BATCH
+from services.result_cache import CacheEntry, ResultCache, write_artifact
+
+MAX_NAME_LENGTH = 200
+PRECOMPUTE_JOB = "precompute"
+
+
+def read_roster(path: str, column: Optional[str]) -> List[str]:
+    """Names from the roster CSV, using `column` or else the first column."""
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return []
+        index = 0
+        if column is not None:
+            if column not in header:
+                raise SystemExit(f"Column {column!r} not found in {path} (columns: {', '.join(header)})")
+            index = header.index(column)
+        names = []
+        for row in reader:
+            if index < len(row):
+                name = " ".join(unicodedata.normalize("NFC", row[index]).split())
+                if name and len(name) <= MAX_NAME_LENGTH:
+                    names.append(name)
+        return names
+
+
+def read_checkpoint(path: Path) -> Dict[str, dict]:
+    """Latest checkpoint record per cache key."""
+    records: Dict[str, dict] = {}
+    if not path.exists():
+        return records
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A run killed mid-write can leave a truncated last line.
+                continue
+            records[record["key"]] = record
+    return records
+
+
+async def run(args: argparse.Namespace) -> int:
+    output_path = Path(args.output)
+    checkpoint_path = Path(args.checkpoint or f"{args.output}.checkpoint.jsonl")
+    report_path = Path(args.report or f"{args.output}.fallbacks.csv")
+
+    # Precompute always asks the model; never answer from an existing artifact.
+    service = AnalysisService(LanguageDetector(), cache=ResultCache(path="", artifact_path=""))
+    version = service.analysis_version
+
+    roster: Dict[str, str] = {}
+    for name in read_roster(args.roster, args.column):
+        roster.setdefault(service.cache_key(name), name)
+
+    # Key by the current scheme, in case canonicaliser flags changed since the checkpoint.
+    records = {service.cache_key(record["name"]): record for record in read_checkpoint(checkpoint_path).values()}
+    done = {key for key, record in records.items() if record.get("output") and record.get("version") == version}
+    pending = [(key, name) for key, name in roster.items() if key not in done]
+    print(f"{len(roster)} unique names, {len(roster) - len(pending)} already done, {len(pending)} to analyse ({version})")
+
+    semaphore = asyncio.Semaphore(max(args.concurrency, 1))
+    completed = 0
+    fallbacks = 0
+    started = time.monotonic()
+
+    try:
+        with checkpoint_path.open("a", encoding="utf-8") as checkpoint:
+            async def analyse(key: str, name: str) -> None:
+                nonlocal completed, fallbacks
+                async with semaphore:
+                    output = await service.analyse_uncached(name, PRIORITY_BATCH, PRECOMPUTE_JOB, "precompute")
+                record = {"key": key, "name": name, "version": version}
+                if output.quality == "fallback":
+                    record["reason"] = output.cultural_notes
+                    fallbacks += 1
+                else:
+                    record["output"] = asdict(output)
+                records[key] = record
+                checkpoint.write(json.dumps(record, ensure_ascii=False) + "\n")
+                checkpoint.flush()
+
+                completed += 1
+                if completed % args.progress_every == 0 or completed == len(pending):
+                    rate = completed / max(time.monotonic() - started, 1e-6)
+                    print(f"{completed}/{len(pending)} analysed, {fallbacks} fallbacks, {rate:.1f} names/s", flush=True)
+
+            await asyncio.gather(*(analyse(key, name) for key, name in pending))
+    finally:
+        # Recordings are buffered; write the tail even if the run is interrupted.
+        service.cassette.flush()
+
+    entries = {
+        key: CacheEntry(name=records[key]["name"], output=records[key]["output"], version=version, stored_at=0.0)
+        for key in roster
+        if key in records and records[key].get("output")
+    }
+    write_artifact(str(output_path), version, service.canonicaliser.key_scheme, entries)
+
+    failed = [records[key] for key in roster if key in records and not records[key].get("output")]
+    with report_path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["name", "reason"])
+        for record in failed:
+            writer.writerow([record["name"], record.get("reason", "")])
+
+    usage = service.usage.job_usage(PRECOMPUTE_JOB)
+    if usage:
+        print(
+            f"Used {usage['total_tokens']} tokens (~${usage['cost_usd']:.4f}), "
+            f"{usage['wasted_tokens']} on attempts that failed the quality gate"
+        )
+    print(f"Wrote {len(entries)} results to {output_path}")
+    print(f"{len(failed)} names fell back to heuristic output; see {report_path}")
+    return 1 if failed else 0
+
+
+def main() -> None:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Analyse a roster ahead of time and write a warm cache artifact.")
+    parser.add_argument("roster", help="Roster CSV file with a header row")
+    parser.add_argument("--output", required=True, help="Artifact path to write (load with WARM_CACHE_ARTIFACT)")
+    parser.add_argument("--column", help="Name column in the roster (default: first column)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent analyses")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint.jsonl)")
+    parser.add_argument("--report", help="Fallback report CSV (default: <output>.fallbacks.csv)")
+    parser.add_argument("--progress-every", type=int, default=25, help="Names between progress lines")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Bulk revalidation of the persisted result cache.
+
+Re-analyses every cached name whose result was produced by a different model
+or prompt version, within the configured rate budget, and reports progress.
+
+Usage (from the backend directory):
+    python -m cli.revalidate_cache --cache-path results.json --rate 60
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import AnalysisService, LanguageDetector
+from services.result_cache import ResultCache
+from services.revalidator import Revalidator
+
+
+async def run(cache_path: str, rate: float, concurrency: int, interval: float) -> int:
+    cache = ResultCache(path=cache_path)
+    service = AnalysisService(LanguageDetector(), cache=cache)
+    service.revalidator = Revalidator(service, rate_per_minute=rate, concurrency=concurrency)
+
+    queued = service.revalidator.enqueue_stale()
+    print(f"{len(cache)} cached results, {queued} stale for version {service.analysis_version}")
+    if not queued:
+        return 0
+
+    drain = asyncio.create_task(service.revalidator.drain())
+    try:
+        while not drain.done():
+            await asyncio.wait({drain}, timeout=interval)
+            progress = service.revalidator.progress()
+            print(
+                f"{progress['percent_complete']:5.1f}% "
+                f"completed={progress['completed']} failed={progress['failed']} "
+                f"remaining={progress['remaining']} eta={progress['eta_seconds']}s",
+                flush=True
+            )
+            cache.save()
+    finally:
+        await service.revalidator.close()
+        cache.save()
+        service.cassette.flush()
+
+    return 1 if service.revalidator.failed else 0
+
+
+def main() -> None:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Re-analyse cached names produced by an older model or prompt.")
+    parser.add_argument("--cache-path", required=True, help="Result cache JSON file (RESULT_CACHE_PATH)")
+    parser.add_argument("--rate", type=float, default=30, help="Maximum analyses per minute")
+    parser.add_argument("--concurrency", type=int, default=2, help="Concurrent revalidations")
+    parser.add_argument("--progress-interval", type=float, default=5, help="Seconds between progress lines")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args.cache_path, args.rate, args.concurrency, args.progress_interval)))
+
+
+if __name__ == "__main__":
+    main()
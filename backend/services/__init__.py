@@ -2,5 +2,9 @@
 
 from .language_detector import LanguageDetector
 from .analysis_service import AnalysisService
+from .cassette import LLMCassette
+from .name_canonicaliser import NameCanonicaliser
+from .llm_scheduler import LLMScheduler, PRIORITY_INTERACTIVE, PRIORITY_BATCH
+from .usage_tracker import UsageTracker
 
-__all__ = ['LanguageDetector', 'AnalysisService']
+__all__ = ['LanguageDetector', 'AnalysisService', 'LLMCassette', 'LLMScheduler', 'NameCanonicaliser', 'PRIORITY_INTERACTIVE', 'PRIORITY_BATCH', 'UsageTracker']
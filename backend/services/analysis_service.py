@@ -2,16 +2,26 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
-from dataclasses import dataclass
+import time
+from dataclasses import asdict, dataclass, replace
 from typing import Any, Dict, Optional, Tuple
 
 import logging
 from openai import AsyncOpenAI
 logger = logging.getLogger(__name__)
 
+from .cassette import LLMCassette
 from .language_detector import LanguageDetector
+from .llm_scheduler import LLMScheduler, PRIORITY_BATCH, PRIORITY_INTERACTIVE
+from .negative_cache import NegativeCache
+from .profiler import mark_phase
+from .name_canonicaliser import NameCanonicaliser
+from .result_cache import CacheEntry, ResultCache
+from .revalidator import Revalidator
+from .usage_tracker import TokenUsage, UsageTracker
 
 
 @dataclass
@@ -55,12 +65,46 @@ LLM_SCHEMA: Dict[str, Any] = {
     "strict": True
 }
 
+SYSTEM_PROMPT = (
+    "You are a professional linguist. Return valid JSON only. "
+    "No markdown, no extra text."
+)
+
+USER_PROMPT_TEMPLATE = (
+    "Name: {name}\n"
+    "Script hint: {language_hint}\n\n"
+    "Return JSON with these keys only:"
+    " language, ipa, macquarie, pronunciation_guidance, confidence, ambiguity, cultural_notes."
+    " confidence is a number between 0 and 1."
+    " ambiguity is null or an object with a note field."
+)
+
+# Changes whenever the prompt text changes, which invalidates cached results.
+PROMPT_VERSION = hashlib.sha256((SYSTEM_PROMPT + USER_PROMPT_TEMPLATE).encode("utf-8")).hexdigest()[:12]
+
 
 class AnalysisService:
     """Primary analysis pipeline using GPT-4.1 with bounded retries."""
 
-    def __init__(self, language_detector: LanguageDetector) -> None:
+    def __init__(
+        self,
+        language_detector: LanguageDetector,
+        scheduler: Optional[LLMScheduler] = None,
+        cache: Optional[ResultCache] = None,
+        negative_cache: Optional[NegativeCache] = None,
+        cassette: Optional[LLMCassette] = None,
+        canonicaliser: Optional[NameCanonicaliser] = None,
+        usage: Optional[UsageTracker] = None
+    ) -> None:
         self.language_detector = language_detector
+        self.canonicaliser = canonicaliser or NameCanonicaliser()
+        self.scheduler = scheduler or LLMScheduler()
+        self.cache = cache if cache is not None else ResultCache()
+        self.cache.rekey(self.canonicaliser.key, self.canonicaliser.key_scheme)
+        self.negative_cache = negative_cache if negative_cache is not None else NegativeCache()
+        self.revalidator = Revalidator(self)
+        self.cassette = cassette if cassette is not None else LLMCassette()
+        self.usage = usage if usage is not None else UsageTracker()
         self.primary_model = os.getenv("PRIMARY_LLM_MODEL", "gpt-4.1")
         self.secondary_model = os.getenv("SECONDARY_LLM_MODEL", "gpt-4.1-mini")
         self.timeout_seconds = float(os.getenv("LLM_TIMEOUT_SECONDS", "4"))
@@ -68,66 +112,202 @@ class AnalysisService:
         api_key = os.getenv("OPENAI_API_KEY")
         self.client = AsyncOpenAI(api_key=api_key, max_retries=0) if api_key else None
 
-    async def analyse(self, name: str) -> AnalysisOutput:
+    @property
+    def analysis_version(self) -> str:
+        """Identifies the model and prompt that produce results; stored with each cache entry."""
+        return f"{self.primary_model}:{PROMPT_VERSION}"
+
+    async def analyse(
+        self,
+        name: str,
+        priority: str = PRIORITY_INTERACTIVE,
+        batch_id: Optional[str] = None,
+        endpoint: Optional[str] = None
+    ) -> AnalysisOutput:
+        entry = self.lookup(name)
+        if entry is not None:
+            return self.output_from_entry(entry, name)
+
+        return await self.analyse_uncached(name, priority, batch_id, endpoint)
+
+    def lookup(self, name: str) -> Optional[CacheEntry]:
+        """Cached result for a name, queueing a background refresh if it is stale."""
+        version = self.analysis_version
+        entry = self.cache.get(self.cache_key(name), version)
+        if entry is not None and entry.version != version:
+            # Serve the stale result now and refresh it in the background.
+            self.revalidator.enqueue(name)
+        return entry
+
+    def cache_key(self, name: str) -> str:
+        """Canonical key shared by spelling variants of a name."""
+        return self.canonicaliser.key(name)
+
+    def output_from_entry(self, entry: CacheEntry, name: str) -> AnalysisOutput:
+        return replace(AnalysisOutput(**entry.output), name_with_diacritics=name)
+
+    async def refresh(
+        self,
+        name: str,
+        priority: str = PRIORITY_BATCH,
+        batch_id: Optional[str] = None,
+        endpoint: Optional[str] = None
+    ) -> bool:
+        """Re-analyse a name bypassing the cache. Returns True if a new result was stored."""
+        output = await self.analyse_uncached(name, priority, batch_id, endpoint)
+        return output.quality != "fallback"
+
+    async def analyse_uncached(
+        self,
+        name: str,
+        priority: str,
+        batch_id: Optional[str],
+        endpoint: Optional[str] = None
+    ) -> AnalysisOutput:
+        """
+        Analyse a name upstream, bypassing the cache.
+
+        Token usage of every attempt is recorded against `endpoint` and the
+        job `batch_id`; attempts stop early once a token budget is reached.
+        """
+        mark_phase("detection")
         language_hint, script_conf = self.language_detector.detect(name)
+        mark_phase("llm")
 
-        if not self.client:
+        if not self.client and not self.cassette.replaying:
             return self._fallback_output(name, language_hint, script_conf, "OPENAI_API_KEY not configured")
 
+        key = self.cache_key(name)
+        failure = self.negative_cache.check(key)
+        if failure is not None:
+            logger.info("Short-circuiting %s after %s failed analyses", name[:50], failure.failures)
+            return self._fallback_output(name, language_hint, script_conf, "Repeated model failures, retrying later")
+
         models = [self.primary_model, self.secondary_model]
+        spent = 0
+        budget_reason = None
+        answered = False
         for model in [m for m in models if m]:
             for attempt in range(self.max_retries + 1):
-                result = await self._call_llm(model, name, language_hint)
+                budget_reason = self.usage.budget_exceeded(spent, batch_id)
+                if budget_reason:
+                    break
+                usage = TokenUsage()
+                try:
+                    async with self.scheduler.slot(priority, batch_id):
+                        result = await self._call_llm(model, name, language_hint, usage)
+                except Exception as exc:
+                    # Timeouts, network and provider errors say nothing about the name.
+                    logger.warning("LLM call failed for %s (attempt %s): %s", model, attempt + 1, exc)
+                    self.usage.record(model, usage, endpoint, batch_id, wasted=True)
+                    continue
+                answered = True
+                spent += usage.total
                 if result:
                     output = self._normalize_output(name, language_hint, result)
                     if self._quality_gate(output):
+                        self.usage.record(model, usage, endpoint, batch_id)
                         output.quality = "high"
                         output.source = "llm-primary" if model == self.primary_model else "llm-secondary"
+                        self.cache.put(key, name, asdict(output), self.analysis_version)
+                        self.negative_cache.record_success(key)
                         return output
+                self.usage.record(model, usage, endpoint, batch_id, wasted=True)
                 logger.warning("LLM output failed quality gate for %s (attempt %s)", model, attempt + 1)
+            if budget_reason:
+                break
 
-        return self._fallback_output(name, language_hint, script_conf, "Model output invalid after retries")
+        if budget_reason:
+            # Not a model failure, so the name is not backed off in the negative cache.
+            logger.info("Stopping analysis of %s: %s", name[:50], budget_reason)
+            return self._fallback_output(name, language_hint, script_conf, budget_reason)
 
-    async def _call_llm(self, model: str, name: str, language_hint: str) -> Optional[Dict[str, Any]]:
-        system_prompt = (
-            "You are a professional linguist. Return valid JSON only. "
-            "No markdown, no extra text."
-        )
-        user_prompt = (
-            f"Name: {name}\n"
-            f"Script hint: {language_hint}\n\n"
-            "Return JSON with these keys only:"
-            " language, ipa, macquarie, pronunciation_guidance, confidence, ambiguity, cultural_notes."
-            " confidence is a number between 0 and 1."
-            " ambiguity is null or an object with a note field."
-        )
+        if not answered:
+            # Upstream was unreachable; do not back the name off for an outage.
+            return self._fallback_output(name, language_hint, script_conf, "Model unavailable, retrying later")
 
-        try:
-            response = await self.client.responses.create(
-                model=model,
-                input=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.2,
-                max_output_tokens=320,
-                timeout=self.timeout_seconds
-            )
-
-            text = getattr(response, "output_text", None)
-            if not text and getattr(response, "output", None):
-                try:
-                    text = response.output[0].content[0].text
-                except Exception:
-                    text = None
-            if not text:
-                return None
+        reason = "Model output invalid after retries"
+        self.negative_cache.record_failure(key, name, reason)
+        return self._fallback_output(name, language_hint, script_conf, reason)
+
+    async def _call_llm(
+        self,
+        model: str,
+        name: str,
+        language_hint: str,
+        usage: Optional[TokenUsage] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Parsed model output, or None if the response was empty or not JSON.
+
+        Transport and provider errors propagate so callers can tell them
+        apart from responses that failed validation.
+        """
+        system_prompt = SYSTEM_PROMPT
+        user_prompt = USER_PROMPT_TEMPLATE.format(name=name, language_hint=language_hint)
+
+        request = {
+            "model": model,
+            "input": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "temperature": 0.2,
+            "max_output_tokens": 320,
+        }
 
+        text = await self._fetch_text(request, usage)
+        if not text:
+            return None
+
+        try:
             payload = json.loads(text)
-            return payload
-        except Exception as exc:
-            logger.warning("LLM call failed for %s: %s", model, exc)
+        except ValueError as exc:
+            logger.warning("LLM returned invalid JSON for %s: %s", model, exc)
             return None
+        return payload if isinstance(payload, dict) else None
+
+    async def _fetch_text(self, request: Dict[str, Any], usage: Optional[TokenUsage] = None) -> Optional[str]:
+        """
+        Send one request upstream, or serve it from the cassette when replaying.
+
+        Provider-reported token counts are copied into `usage` and recorded
+        in the cassette alongside the response text.
+        """
+        if self.cassette.replaying:
+            recorded = await self.cassette.replay("openai", request)
+            if recorded is None:
+                raise LookupError("No cassette recording for request")
+            if recorded.get("error"):
+                raise RuntimeError(recorded["error"])
+            if usage is not None:
+                usage.input_tokens = recorded.get("usage", {}).get("input_tokens", 0)
+                usage.output_tokens = recorded.get("usage", {}).get("output_tokens", 0)
+            return recorded.get("text")
+
+        started = time.perf_counter()
+        try:
+            response = await self.client.responses.create(**request, timeout=self.timeout_seconds)
+        except Exception as exc:
+            self.cassette.record("openai", request, {"error": str(exc) or type(exc).__name__}, time.perf_counter() - started)
+            raise
+
+        text = getattr(response, "output_text", None)
+        if not text and getattr(response, "output", None):
+            try:
+                text = response.output[0].content[0].text
+            except Exception:
+                text = None
+        reported = getattr(response, "usage", None)
+        tokens = {
+            "input_tokens": getattr(reported, "input_tokens", None) or 0,
+            "output_tokens": getattr(reported, "output_tokens", None) or 0,
+        }
+        if usage is not None:
+            usage.input_tokens = tokens["input_tokens"]
+            usage.output_tokens = tokens["output_tokens"]
+        self.cassette.record("openai", request, {"text": text, "usage": tokens}, time.perf_counter() - started)
+        return text
 
     def _normalize_output(self, name: str, language_hint: str, payload: Dict[str, Any]) -> AnalysisOutput:
         language = str(payload.get("language") or language_hint).strip()
@@ -0,0 +1,137 @@
+"""Record/replay cassette for raw upstream LLM requests and responses."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import logging
+logger = logging.getLogger(__name__)
+
+MODE_OFF = "off"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+MODES = (MODE_OFF, MODE_RECORD, MODE_REPLAY)
+
+
+class LLMCassette:
+    """
+    Captures every raw LLM exchange to a gzipped JSON Lines archive.
+
+    In record mode each request, its response text (or error) and the elapsed
+    time are buffered and appended to the archive. In replay mode responses
+    are served from the archive without touching the network: recordings for
+    the same request are returned in the order they were captured, cycling
+    when exhausted, so runs are deterministic. Recorded latency can be
+    reproduced by setting `timing_scale` (1.0 is real time, 0 disables it).
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        path: Optional[str] = None,
+        timing_scale: Optional[float] = None,
+        flush_every: int = 50
+    ) -> None:
+        if mode is None:
+            mode = os.getenv("LLM_CASSETTE_MODE", MODE_OFF).strip().lower()
+        if path is None:
+            path = os.getenv("LLM_CASSETTE_PATH", "llm_cassette.jsonl.gz")
+        if timing_scale is None:
+            timing_scale = float(os.getenv("LLM_CASSETTE_TIMING_SCALE", "0"))
+        if mode not in MODES:
+            raise ValueError(f"Unknown LLM cassette mode: {mode}")
+
+        self.mode = mode
+        self.path = Path(path)
+        self.timing_scale = max(timing_scale, 0.0)
+        self.flush_every = max(flush_every, 1)
+        self._buffer: List[Dict[str, Any]] = []
+        self._recordings: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursors: Dict[str, int] = {}
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+
+        if self.replaying:
+            self._load()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == MODE_RECORD
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == MODE_REPLAY
+
+    @staticmethod
+    def request_key(provider: str, request: Dict[str, Any]) -> str:
+        canonical = json.dumps({"provider": provider, "request": request}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def record(self, provider: str, request: Dict[str, Any], response: Dict[str, Any], elapsed: float) -> None:
+        """Buffer one exchange. `response` holds either `text` or `error`."""
+        if not self.recording:
+            return
+        self._buffer.append({
+            "key": self.request_key(provider, request),
+            "provider": provider,
+            "request": request,
+            "response": response,
+            "elapsed_ms": round(elapsed * 1000, 1),
+        })
+        self.recorded += 1
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    async def replay(self, provider: str, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the next recorded response for this request, or None if it was never recorded."""
+        key = self.request_key(provider, request)
+        recordings = self._recordings.get(key)
+        if not recordings:
+            self.misses += 1
+            logger.warning("No cassette recording for %s request to %s", provider, request.get("model"))
+            return None
+
+        index = self._cursors.get(key, 0)
+        self._cursors[key] = (index + 1) % len(recordings)
+        entry = recordings[index]
+        self.replayed += 1
+        if self.timing_scale:
+            await asyncio.sleep(entry.get("elapsed_ms", 0) / 1000 * self.timing_scale)
+        return entry["response"]
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in self._buffer)
+        # Each flush appends a gzip member; readers see one continuous stream.
+        with gzip.open(self.path, "at", encoding="utf-8") as handle:
+            handle.write(lines)
+        self._buffer = []
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            logger.warning("LLM cassette %s not found; every request will miss", self.path)
+            return
+        with gzip.open(self.path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._recordings.setdefault(entry["key"], []).append(entry)
+        logger.info("Loaded %s cassette recordings from %s", sum(len(v) for v in self._recordings.values()), self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses,
+        }
@@ -0,0 +1,197 @@
+"""Streaming roster exports: CSV, JSON Lines and a printable HTML reader sheet."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import html
+import io
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import logging
+logger = logging.getLogger(__name__)
+
+from .serialisation import dumps_json
+
+# (roster index, name, response payload or None when no result is available)
+Row = Tuple[int, str, Optional[Dict[str, Any]]]
+
+CSV_FIELDS = ("order", "name", "ipa", "macquarie", "pronunciation_guidance", "language", "confidence", "quality")
+
+EXPORT_FORMATS = {
+    # format: (media type, file extension)
+    "csv": ("text/csv", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "html": ("text/html", "html"),
+}
+
+
+async def ordered_rows(
+    names: List[str],
+    lookup: Callable[[int, str], Optional[Dict[str, Any]]],
+    analyse: Optional[Callable[[int, str], Awaitable[Dict[str, Any]]]] = None,
+    window: int = 8
+) -> AsyncIterator[Row]:
+    """
+    Yield roster rows in order, resolving at most `window` rows ahead.
+
+    `lookup` answers from results already held (cache or job); misses are
+    passed to `analyse` concurrently within the window, or yielded as None
+    when no analyser is given. Memory stays bounded by the window however
+    long the roster is.
+    """
+    window = max(window, 1)
+    ahead: Dict[int, Any] = {}
+    scheduled = 0
+    try:
+        for index, name in enumerate(names):
+            while scheduled < min(index + window, len(names)):
+                result = lookup(scheduled, names[scheduled])
+                if result is None and analyse is not None:
+                    result = asyncio.create_task(analyse(scheduled, names[scheduled]))
+                ahead[scheduled] = result
+                scheduled += 1
+
+            result = ahead.pop(index)
+            if isinstance(result, asyncio.Task):
+                try:
+                    result = await result
+                except Exception as exc:
+                    logger.warning("Export analysis failed for %s: %s", name[:50], exc)
+                    result = None
+            yield index, name, result
+    finally:
+        # The client disconnected or the export finished early.
+        for result in ahead.values():
+            if isinstance(result, asyncio.Task):
+                result.cancel()
+
+
+def row_status(result: Optional[Dict[str, Any]]) -> str:
+    if result is None:
+        return "pending"
+    return "fallback" if result.get("quality") == "fallback" else "ready"
+
+
+class _Chunker:
+    """Groups encoded rows into chunks, flushing on size or when rows arrive slowly."""
+
+    def __init__(self, chunk_rows: int, flush_seconds: float) -> None:
+        self.chunk_rows = max(chunk_rows, 1)
+        self.flush_seconds = flush_seconds
+        self._parts: List[str] = []
+        self._last_flush = time.monotonic()
+
+    def add(self, text: str) -> Optional[bytes]:
+        self._parts.append(text)
+        now = time.monotonic()
+        if len(self._parts) >= self.chunk_rows or now - self._last_flush >= self.flush_seconds:
+            self._last_flush = now
+            return self.flush()
+        return None
+
+    def flush(self) -> bytes:
+        chunk = "".join(self._parts).encode("utf-8")
+        self._parts.clear()
+        return chunk
+
+
+async def csv_export(rows: AsyncIterator[Row], chunk_rows: int = 200, flush_seconds: float = 0.5) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def encode(values: List[Any]) -> str:
+        writer.writerow(values)
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    # Byte order mark so spreadsheet apps read non-ASCII names as UTF-8.
+    yield ("\ufeff" + encode([*CSV_FIELDS, "status"])).encode("utf-8")
+
+    chunker = _Chunker(chunk_rows, flush_seconds)
+    async for index, name, result in rows:
+        status = row_status(result)
+        result = result or {}
+        values = [
+            index + 1,
+            result.get("name") or name,
+            result.get("ipa", ""),
+            result.get("macquarie", ""),
+            result.get("pronunciation_guidance", ""),
+            result.get("language", ""),
+            result.get("confidence", ""),
+            result.get("quality", ""),
+            status,
+        ]
+        chunk = chunker.add(encode(values))
+        if chunk:
+            yield chunk
+    yield chunker.flush()
+
+
+async def jsonl_export(rows: AsyncIterator[Row], chunk_rows: int = 200, flush_seconds: float = 0.5) -> AsyncIterator[bytes]:
+    chunker = _Chunker(chunk_rows, flush_seconds)
+    async for index, name, result in rows:
+        line = {"order": index + 1, "name": name, "status": row_status(result), "result": result}
+        chunk = chunker.add(dumps_json(line).decode("utf-8") + "\n")
+        if chunk:
+            yield chunk
+    yield chunker.flush()
+
+
+READER_SHEET_STYLE = """
+body { font-family: system-ui, sans-serif; margin: 1.5rem; color: #111; }
+h1 { font-size: 1.4rem; margin: 0 0 0.25rem; }
+p.meta { color: #555; margin: 0 0 1rem; font-size: 0.85rem; }
+table { width: 100%; border-collapse: collapse; }
+thead { display: table-header-group; }
+th { text-align: left; font-size: 0.8rem; text-transform: uppercase; color: #555; border-bottom: 2px solid #111; padding: 0.3rem; }
+td { vertical-align: top; border-bottom: 1px solid #ccc; padding: 0.45rem 0.3rem; }
+tr { page-break-inside: avoid; break-inside: avoid; }
+td.order { color: #555; width: 3rem; }
+td.name { font-size: 1.15rem; font-weight: 600; }
+td.say { font-size: 1.15rem; }
+td.say .ipa { display: block; font-size: 0.85rem; color: #444; }
+td.guidance { font-size: 0.9rem; }
+tr.fallback td.say::after, tr.pending td.say::after { display: block; font-size: 0.8rem; font-weight: 600; color: #a33; }
+tr.fallback td.say::after { content: "Check pronunciation with the graduate"; }
+tr.pending td.say::after { content: "Not yet analysed"; }
+@media print { body { margin: 0; } p.meta { display: none; } }
+"""
+
+
+async def html_export(
+    rows: AsyncIterator[Row],
+    title: str,
+    total: int,
+    chunk_rows: int = 100,
+    flush_seconds: float = 0.5
+) -> AsyncIterator[bytes]:
+    escaped_title = html.escape(title)
+    generated = time.strftime("%Y-%m-%d %H:%M")
+    yield (
+        "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>{escaped_title}</title>\n<style>{READER_SHEET_STYLE}</style>\n</head>\n<body>\n"
+        f"<h1>{escaped_title}</h1>\n<p class=\"meta\">{total} names &middot; generated {generated}</p>\n"
+        "<table>\n<thead><tr><th>#</th><th>Name</th><th>Say</th><th>Guidance</th></tr></thead>\n<tbody>\n"
+    ).encode("utf-8")
+
+    chunker = _Chunker(chunk_rows, flush_seconds)
+    async for index, name, result in rows:
+        status = row_status(result)
+        result = result or {}
+        ipa = result.get("ipa", "")
+        ipa_html = f"<span class=\"ipa\">{html.escape(ipa)}</span>" if ipa else ""
+        row = (
+            f"<tr class=\"{status}\"><td class=\"order\">{index + 1}</td>"
+            f"<td class=\"name\">{html.escape(result.get('name') or name)}</td>"
+            f"<td class=\"say\">{html.escape(result.get('macquarie', ''))}{ipa_html}</td>"
+            f"<td class=\"guidance\">{html.escape(result.get('pronunciation_guidance', ''))}</td></tr>\n"
+        )
+        chunk = chunker.add(row)
+        if chunk:
+            yield chunk
+    yield chunker.flush() + b"</tbody>\n</table>\n</body>\n</html>\n"
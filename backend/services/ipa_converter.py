@@ -10,15 +10,33 @@ import os
 import logging
 import json
 import re
+import time
 from google import genai
 
+from .cassette import LLMCassette
+from .llm_scheduler import LLMScheduler, PRIORITY_INTERACTIVE
+from .usage_tracker import TokenUsage, UsageTracker
+
 logger = logging.getLogger(__name__)
 class IPAConverter:
     """Converts names to IPA and Macquarie phonetic notation using Gemini API."""
 
-    def __init__(self):
-        """Initialise pronunciation converter with Gemini API client."""
+    def __init__(
+        self,
+        scheduler: LLMScheduler,
+        cassette: Optional[LLMCassette] = None,
+        usage: Optional[UsageTracker] = None
+    ):
+        """
+        Initialise pronunciation converter with Gemini API client.
+
+        `scheduler` must be the process-wide LLM scheduler (as passed to
+        AnalysisService) so Gemini calls share its concurrency limit.
+        """
         self.client = None
+        self.scheduler = scheduler
+        self.cassette = cassette if cassette is not None else LLMCassette()
+        self.usage = usage if usage is not None else UsageTracker()
         self.model = os.getenv('GEMINI_MODEL', 'gemini-2.5-pro')
         fallback_models_env = os.getenv('GEMINI_MODEL_FALLBACKS', 'gemini-2.5-flash,gemini-2.5-flash-lite')
         self.fallback_models = [m.strip() for m in fallback_models_env.split(',') if m.strip()]
@@ -38,13 +56,23 @@ class IPAConverter:
             logger.info("Add your API key to backend/.env for accurate IPA and Macquarie notation")
             logger.info("Run: ./add-api-key.sh")
 
-    async def analyse_pronunciation(self, text: str, language: str) -> Dict[str, Any]:
+    async def analyse_pronunciation(
+        self,
+        text: str,
+        language: str,
+        priority: str = PRIORITY_INTERACTIVE,
+        batch_id: Optional[str] = None,
+        endpoint: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Analyse name pronunciation using Gemini API.
 
         Args:
             text: The name to analyse
             language: The detected language
+            priority: Scheduler priority class for upstream calls
+            batch_id: Batch the request belongs to, for fair sharing between batches
+            endpoint: Caller label for token usage accounting
 
         Returns:
             Dictionary containing IPA, Macquarie notation, and pronunciation guidance
@@ -56,10 +84,10 @@ class IPAConverter:
                 'guidance': ''
             }
 
-        # Try Gemini API analysis if available
-        if self.client:
+        # Try Gemini API analysis if available (or replayable from a cassette)
+        if self.client or self.cassette.replaying:
             try:
-                return await self._analyse_with_gemini(text, language)
+                return await self._analyse_with_gemini(text, language, priority, batch_id, endpoint)
             except Exception as e:
                 logger.error(f"Error using Gemini API: {e}")
                 logger.info("Falling back to simplified notation")
@@ -75,27 +103,46 @@ class IPAConverter:
         result = await self.analyse_pronunciation(text, language)
         return result.get('ipa', '')
 
-    async def _analyse_with_gemini(self, text: str, language: str) -> Dict[str, Any]:
+    async def _analyse_with_gemini(
+        self,
+        text: str,
+        language: str,
+        priority: str = PRIORITY_INTERACTIVE,
+        batch_id: Optional[str] = None,
+        endpoint: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Use Gemini API for comprehensive pronunciation analysis with language inference.
 
         Args:
             text: The name to analyse
             language: The script-detected language (may be "English" for Romanized text)
+            priority: Scheduler priority class for upstream calls
+            batch_id: Batch the request belongs to, for fair sharing between batches
+            endpoint: Caller label for token usage accounting
 
         Returns:
             Dictionary with inferred language, IPA, Macquarie notation, romanized form with diacritics, and guidance
         """
         attempts = 1
         last_error = None
+        spent = 0
 
         for model in self._candidate_models():
             for attempt in range(1, attempts + 1):
+                budget_reason = self.usage.budget_exceeded(spent, batch_id)
+                if budget_reason:
+                    logger.info(f"Stopping Gemini analysis: {budget_reason}")
+                    return self._fallback_from_name(text, language)
+                usage = TokenUsage()
+                wasted = True
                 try:
-                    minimal = await self._analyse_with_minimal_prompt(text, language, model)
+                    async with self.scheduler.slot(priority, batch_id):
+                        minimal = await self._analyse_with_minimal_prompt(text, language, model, usage)
                     if minimal:
                         completed = self._complete_output(minimal, text)
                         if self._is_quality_output(completed):
+                            wasted = False
                             return completed
                         last_error = ValueError("Minimal output failed quality gate")
                         logger.warning(f"Gemini minimal output quality failed for {model} (attempt {attempt}/{attempts})")
@@ -108,6 +155,9 @@ class IPAConverter:
                 except Exception as e:
                     last_error = e
                     logger.warning(f"Gemini call failed for {model} (attempt {attempt}/{attempts}): {e}")
+                finally:
+                    spent += usage.total
+                    self.usage.record(model, usage, endpoint, batch_id, wasted=wasted)
 
         logger.error(f"Gemini analysis failed after retries: {last_error}")
         return self._fallback_from_name(text, language)
@@ -132,7 +182,13 @@ class IPAConverter:
     def _is_quality_output(self, output: Dict[str, Any]) -> bool:
         return bool(output.get('ipa') and output.get('macquarie') and output.get('guidance'))
 
-    async def _analyse_with_minimal_prompt(self, text: str, language: str, model: str) -> Optional[Dict[str, Any]]:
+    async def _analyse_with_minimal_prompt(
+        self,
+        text: str,
+        language: str,
+        model: str,
+        usage: Optional[TokenUsage] = None
+    ) -> Optional[Dict[str, Any]]:
         prompt = f"""Give pronunciation fields for this name.
 Name: {text}
 Language hint: {language}
@@ -145,21 +201,13 @@ MACQUARIE: <australian-friendly pronunciation>
 GUIDANCE: <short guidance>
 """
 
-        try:
-            response = await asyncio.wait_for(
-                self.client.aio.models.generate_content(
-                    model=model,
-                    contents=prompt,
-                    config=genai.types.GenerateContentConfig(
-                        max_output_tokens=220,
-                    ),
-                ),
-                timeout=min(self.request_timeout_seconds, 7),
-            )
-            text_out = (getattr(response, "text", "") or "").strip()
-            if not text_out:
-                return None
+        # Upstream errors and replay misses propagate so the caller classifies them
+        # as failed calls rather than unusable output.
+        text_out = (await self._generate_text(model, prompt, max_output_tokens=220, usage=usage) or "").strip()
+        if not text_out:
+            return None
 
+        try:
             def line_value(key: str) -> str:
                 for line in text_out.splitlines():
                     if line.upper().startswith(f"{key}:"):
@@ -216,6 +264,58 @@ GUIDANCE: <short guidance>
         except Exception:
             return None
 
+    async def _generate_text(
+        self,
+        model: str,
+        prompt: str,
+        max_output_tokens: int,
+        usage: Optional[TokenUsage] = None
+    ) -> Optional[str]:
+        """Send one prompt to Gemini, or serve it from the cassette when replaying."""
+        request = {
+            'model': model,
+            'contents': prompt,
+            'max_output_tokens': max_output_tokens,
+        }
+        if self.cassette.replaying:
+            recorded = await self.cassette.replay('gemini', request)
+            if recorded is None:
+                raise LookupError("No cassette recording for request")
+            if recorded.get('error'):
+                raise RuntimeError(recorded['error'])
+            if usage is not None:
+                usage.input_tokens = recorded.get('usage', {}).get('input_tokens', 0)
+                usage.output_tokens = recorded.get('usage', {}).get('output_tokens', 0)
+            return recorded.get('text')
+
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(
+                self.client.aio.models.generate_content(
+                    model=model,
+                    contents=prompt,
+                    config=genai.types.GenerateContentConfig(
+                        max_output_tokens=max_output_tokens,
+                    ),
+                ),
+                timeout=min(self.request_timeout_seconds, 7),
+            )
+        except Exception as e:
+            self.cassette.record('gemini', request, {'error': str(e) or type(e).__name__}, time.perf_counter() - started)
+            raise
+
+        text_out = getattr(response, "text", "") or ""
+        metadata = getattr(response, "usage_metadata", None)
+        tokens = {
+            'input_tokens': getattr(metadata, "prompt_token_count", None) or 0,
+            'output_tokens': getattr(metadata, "candidates_token_count", None) or 0,
+        }
+        if usage is not None:
+            usage.input_tokens = tokens['input_tokens']
+            usage.output_tokens = tokens['output_tokens']
+        self.cassette.record('gemini', request, {'text': text_out, 'usage': tokens}, time.perf_counter() - started)
+        return text_out
+
     def _candidate_models(self) -> list[str]:
         ordered = [self.model, *self.fallback_models]
         seen = set()
@@ -4,7 +4,53 @@ Detects language origin of names based on character scripts.
 """
 
 import re
-from typing import Dict, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Tuple
+
+
+# Name-structure notes per language, built once and shared read-only
+LANGUAGE_INFO: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    language: MappingProxyType(info)
+    for language, info in {
+        'Chinese': {
+            'family_name_first': True,
+            'note': 'Chinese names typically have family name first, followed by given name.',
+        },
+        'Japanese': {
+            'family_name_first': True,
+            'note': 'Japanese names typically have family name first in traditional format.',
+        },
+        'Korean': {
+            'family_name_first': True,
+            'note': 'Korean names have family name first, usually one syllable.',
+        },
+        'Vietnamese': {
+            'family_name_first': True,
+            'note': 'Vietnamese names have family name first. Tones are important for pronunciation.',
+        },
+        'Hindi': {
+            'family_name_first': False,
+            'note': 'Indian names vary by region. Given name typically comes first.',
+        },
+        'Thai': {
+            'family_name_first': False,
+            'note': 'Thai names have given name first. Nicknames are commonly used.',
+        },
+        'Arabic': {
+            'family_name_first': False,
+            'note': 'Arabic names often include patronymic (father\'s name) and family name.',
+        },
+        'English': {
+            'family_name_first': False,
+            'note': 'Western names typically have given name first, family name last.',
+        },
+    }.items()
+})
+
+DEFAULT_LANGUAGE_INFO: Mapping[str, Any] = MappingProxyType({
+    'family_name_first': False,
+    'note': 'Name structure varies by culture.',
+})
 
 
 class LanguageDetector:
@@ -108,7 +154,7 @@ class LanguageDetector:
 
         return (script_name, min(confidence, 1.0))
 
-    def get_language_info(self, language: str) -> Dict[str, str]:
+    def get_language_info(self, language: str) -> Mapping[str, Any]:
         """
         Get additional information about a detected language.
 
@@ -116,44 +162,6 @@ class LanguageDetector:
             language: The detected language name
 
         Returns:
-            Dictionary with language information
+            Read-only mapping with language information, shared between calls
         """
-        info = {
-            'Chinese': {
-                'family_name_first': True,
-                'note': 'Chinese names typically have family name first, followed by given name.',
-            },
-            'Japanese': {
-                'family_name_first': True,
-                'note': 'Japanese names typically have family name first in traditional format.',
-            },
-            'Korean': {
-                'family_name_first': True,
-                'note': 'Korean names have family name first, usually one syllable.',
-            },
-            'Vietnamese': {
-                'family_name_first': True,
-                'note': 'Vietnamese names have family name first. Tones are important for pronunciation.',
-            },
-            'Hindi': {
-                'family_name_first': False,
-                'note': 'Indian names vary by region. Given name typically comes first.',
-            },
-            'Thai': {
-                'family_name_first': False,
-                'note': 'Thai names have given name first. Nicknames are commonly used.',
-            },
-            'Arabic': {
-                'family_name_first': False,
-                'note': 'Arabic names often include patronymic (father\'s name) and family name.',
-            },
-            'English': {
-                'family_name_first': False,
-                'note': 'Western names typically have given name first, family name last.',
-            },
-        }
-
-        return info.get(language, {
-            'family_name_first': False,
-            'note': 'Name structure varies by culture.',
-        })
+        return LANGUAGE_INFO.get(language, DEFAULT_LANGUAGE_INFO)
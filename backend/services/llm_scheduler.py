@@ -0,0 +1,206 @@
+"""Priority-aware concurrency scheduler shared by all upstream LLM calls."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BATCH)
+
+DEFAULT_BATCH_ID = "default"
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future
+    priority: str
+    batch_id: Optional[str]
+    enqueued_at: float
+
+
+class LLMScheduler:
+    """
+    Global concurrency cap for LLM calls with interactive-before-batch ordering.
+
+    Interactive waiters are always granted a slot before batch waiters. Batch
+    waiters are grouped by batch id and served round-robin so concurrent
+    roster jobs share the remaining capacity fairly. A number of slots can be
+    reserved for interactive traffic so a saturating batch never forces a
+    front-desk lookup to wait for a batch call to finish.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        interactive_reserved: Optional[int] = None,
+        wait_sample_size: int = 1000
+    ) -> None:
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        if interactive_reserved is None:
+            interactive_reserved = int(os.getenv("LLM_INTERACTIVE_RESERVED", "2"))
+        self.max_concurrency = max(max_concurrency, 1)
+        self.interactive_reserved = min(max(interactive_reserved, 0), self.max_concurrency - 1)
+
+        self._active: Dict[str, int] = {p: 0 for p in PRIORITIES}
+        self._interactive: Deque[_Waiter] = deque()
+        self._batches: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._granted: Dict[str, int] = {p: 0 for p in PRIORITIES}
+        self._waits: Dict[str, Deque[float]] = {p: deque(maxlen=wait_sample_size) for p in PRIORITIES}
+        self._max_queue_depth: Dict[str, int] = {p: 0 for p in PRIORITIES}
+
+    @property
+    def batch_capacity(self) -> int:
+        return self.max_concurrency - self.interactive_reserved
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: str = PRIORITY_INTERACTIVE,
+        batch_id: Optional[str] = None
+    ) -> AsyncIterator[None]:
+        """Hold one upstream LLM slot for the duration of the block."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown LLM priority: {priority}")
+        if priority == PRIORITY_BATCH:
+            batch_id = batch_id or DEFAULT_BATCH_ID
+
+        await self._acquire(priority, batch_id)
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    async def _acquire(self, priority: str, batch_id: Optional[str]) -> None:
+        enqueued_at = time.perf_counter()
+        if self._can_start_now(priority):
+            self._grant(priority, enqueued_at)
+            return
+
+        waiter = _Waiter(
+            future=asyncio.get_running_loop().create_future(),
+            priority=priority,
+            batch_id=batch_id,
+            enqueued_at=enqueued_at
+        )
+        if priority == PRIORITY_INTERACTIVE:
+            self._interactive.append(waiter)
+        else:
+            self._batches.setdefault(batch_id, deque()).append(waiter)
+        self._max_queue_depth[priority] = max(self._max_queue_depth[priority], self._queue_depth(priority))
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Slot was handed over just before cancellation; pass it on.
+                self._release(priority)
+            else:
+                self._discard(waiter)
+            raise
+
+    def _release(self, priority: str) -> None:
+        self._active[priority] -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while True:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            if not waiter.future.done():
+                self._grant(waiter.priority, waiter.enqueued_at)
+                waiter.future.set_result(None)
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        if self._interactive and self._can_start(PRIORITY_INTERACTIVE):
+            return self._interactive.popleft()
+        if self._batches and self._can_start(PRIORITY_BATCH):
+            batch_id, queue = next(iter(self._batches.items()))
+            waiter = queue.popleft()
+            # Rotate so the next batch slot goes to a different job.
+            del self._batches[batch_id]
+            if queue:
+                self._batches[batch_id] = queue
+            return waiter
+        return None
+
+    def _can_start(self, priority: str) -> bool:
+        total_active = sum(self._active.values())
+        if total_active >= self.max_concurrency:
+            return False
+        if priority == PRIORITY_BATCH:
+            return self._active[PRIORITY_BATCH] < self.batch_capacity
+        return True
+
+    def _grant(self, priority: str, enqueued_at: float) -> None:
+        self._active[priority] += 1
+        self._granted[priority] += 1
+        self._waits[priority].append(time.perf_counter() - enqueued_at)
+
+    def _discard(self, waiter: _Waiter) -> None:
+        if waiter.priority == PRIORITY_INTERACTIVE:
+            try:
+                self._interactive.remove(waiter)
+            except ValueError:
+                pass
+            return
+        queue = self._batches.get(waiter.batch_id)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            pass
+        if not queue:
+            del self._batches[waiter.batch_id]
+
+    def _can_start_now(self, priority: str) -> bool:
+        # Never jump ahead of an already-queued waiter of equal or higher priority.
+        if self._interactive:
+            return False
+        if priority == PRIORITY_BATCH and self._batches:
+            return False
+        return self._can_start(priority)
+
+    def _queue_depth(self, priority: str) -> int:
+        if priority == PRIORITY_INTERACTIVE:
+            return len(self._interactive)
+        return sum(len(queue) for queue in self._batches.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth, active slots and wait-time percentiles."""
+        priorities: Dict[str, Any] = {}
+        for priority in PRIORITIES:
+            waits_ms = sorted(w * 1000 for w in self._waits[priority])
+            priorities[priority] = {
+                "active": self._active[priority],
+                "queue_depth": self._queue_depth(priority),
+                "max_queue_depth": self._max_queue_depth[priority],
+                "granted": self._granted[priority],
+                "wait_ms_p50": _percentile(waits_ms, 0.50),
+                "wait_ms_p95": _percentile(waits_ms, 0.95),
+                "wait_ms_max": round(waits_ms[-1], 2) if waits_ms else 0.0,
+            }
+
+        return {
+            "max_concurrency": self.max_concurrency,
+            "interactive_reserved": self.interactive_reserved,
+            "active": sum(self._active.values()),
+            "priorities": priorities,
+            "batches": {batch_id: len(queue) for batch_id, queue in self._batches.items()},
+        }
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return round(sorted_values[index], 2)
@@ -0,0 +1,86 @@
+"""Canonical lookup keys that fold spelling variants of the same name."""
+
+from __future__ import annotations
+
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Optional
+
+# Typographic apostrophes fold to ASCII; hyphens, dashes and separators to spaces
+PUNCTUATION_MAP = str.maketrans({
+    "‘": "'", "’": "'", "ʼ": "'", "`": "'", "´": "'",
+    "-": " ", "‐": " ", "‑": " ", "‒": " ", "–": " ", "—": " ",
+    ".": " ", ",": " ", "_": " ",
+})
+
+# Latin letters whose base form is not reachable by stripping combining marks
+LATIN_FOLD_MAP = str.maketrans({
+    "đ": "d", "ð": "d", "ł": "l", "ø": "o", "ħ": "h", "ı": "i", "æ": "ae", "œ": "oe", "þ": "th",
+})
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Bump whenever the folding rules change, so persisted keys are rebuilt.
+KEY_SCHEME_VERSION = 2
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "false").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _is_latin_script(value: str) -> bool:
+    return all(unicodedata.name(c, "").startswith("LATIN") for c in value if c.isalpha())
+
+
+class NameCanonicaliser:
+    """
+    Builds cache keys so that trivially different spellings share one result.
+
+    Keys always apply NFC (as `validate_name` does), case folding, typographic
+    punctuation folding and whitespace collapsing. Two optional folds widen
+    matching further:
+
+    - `fold_diacritics`: "Nguyen Thi Huong" matches "Nguyễn Thị Hương". Only
+      applied when every letter is Latin; marks in any other script (Tamil
+      virama, Hebrew points, ...) distinguish names and are kept.
+    - `ignore_order`: "Wei Zhang" matches "Zhang Wei". The cached IPA then
+      follows the order of whichever variant was analysed first.
+
+    Keys only select the cached result; the displayed name is always the one
+    the caller submitted.
+    """
+
+    def __init__(
+        self,
+        fold_diacritics: Optional[bool] = None,
+        ignore_order: Optional[bool] = None
+    ) -> None:
+        if fold_diacritics is None:
+            fold_diacritics = _env_flag("CACHE_FOLD_DIACRITICS")
+        if ignore_order is None:
+            ignore_order = _env_flag("CACHE_IGNORE_NAME_ORDER")
+        self.fold_diacritics = fold_diacritics
+        self.ignore_order = ignore_order
+        # Identifies the key rules and flags, stored with persisted cache entries.
+        self.key_scheme = (
+            f"v{KEY_SCHEME_VERSION}:diacritics={int(fold_diacritics)}:order={int(ignore_order)}"
+        )
+        # Canonical lookup key for a name. Hot names are looked up repeatedly;
+        # memoise per instance.
+        self.key = lru_cache(maxsize=4096)(self._key)
+
+    def _key(self, name: str) -> str:
+        value = unicodedata.normalize("NFC", name).casefold().translate(PUNCTUATION_MAP)
+
+        if self.fold_diacritics and _is_latin_script(value):
+            decomposed = unicodedata.normalize("NFD", value.translate(LATIN_FOLD_MAP))
+            value = unicodedata.normalize(
+                "NFC", "".join(c for c in decomposed if unicodedata.category(c) != "Mn")
+            )
+
+        tokens = _WHITESPACE.split(value.strip())
+        if self.ignore_order:
+            tokens.sort()
+        return " ".join(tokens)
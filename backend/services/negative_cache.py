@@ -0,0 +1,109 @@
+"""Negative cache for names that repeatedly fail the LLM quality gate."""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class FailureRecord:
+    name: str
+    failures: int
+    reason: str
+    last_failure: float
+    blocked_until: float
+    short_circuits: int = 0
+
+
+class NegativeCache:
+    """
+    Tracks recent analysis failures per normalised name.
+
+    Once a name has exhausted its retries `threshold` times in a row it is
+    short-circuited straight to the fallback output for a cooling-off period
+    that doubles with each further failure, up to `max_seconds`. A successful
+    analysis clears the record.
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[int] = None,
+        base_seconds: Optional[float] = None,
+        max_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None
+    ) -> None:
+        if threshold is None:
+            threshold = int(os.getenv("NEGATIVE_CACHE_THRESHOLD", "2"))
+        if base_seconds is None:
+            base_seconds = float(os.getenv("NEGATIVE_CACHE_BASE_SECONDS", "60"))
+        if max_seconds is None:
+            max_seconds = float(os.getenv("NEGATIVE_CACHE_MAX_SECONDS", "21600"))
+        if max_entries is None:
+            max_entries = int(os.getenv("NEGATIVE_CACHE_MAX_ENTRIES", "5000"))
+        self.threshold = max(threshold, 1)
+        self.base_seconds = max(base_seconds, 0.0)
+        self.max_seconds = max(max_seconds, self.base_seconds)
+        self.max_entries = max(max_entries, 1)
+        self._records: "OrderedDict[str, FailureRecord]" = OrderedDict()
+        self.short_circuits = 0
+
+    def check(self, key: str) -> Optional[FailureRecord]:
+        """Return the failure record if the name is cooling off, counting the short-circuit."""
+        record = self._records.get(key)
+        if record is None or record.blocked_until <= time.time():
+            return None
+        record.short_circuits += 1
+        self.short_circuits += 1
+        return record
+
+    def record_failure(self, key: str, name: str, reason: str) -> FailureRecord:
+        now = time.time()
+        record = self._records.pop(key, None)
+        failures = record.failures + 1 if record else 1
+        if failures >= self.threshold:
+            cooling_off = min(self.base_seconds * (2 ** (failures - self.threshold)), self.max_seconds)
+        else:
+            cooling_off = 0.0
+        record = FailureRecord(
+            name=name,
+            failures=failures,
+            reason=reason,
+            last_failure=now,
+            blocked_until=now + cooling_off,
+            short_circuits=record.short_circuits if record else 0
+        )
+        self._records[key] = record
+        while len(self._records) > self.max_entries:
+            self._records.popitem(last=False)
+        return record
+
+    def record_success(self, key: str) -> None:
+        self._records.pop(key, None)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Names currently being short-circuited, longest cooling-off first."""
+        now = time.time()
+        blocked = [r for r in self._records.values() if r.blocked_until > now]
+        blocked.sort(key=lambda r: r.blocked_until, reverse=True)
+        return [
+            {
+                "name": r.name,
+                "failures": r.failures,
+                "reason": r.reason,
+                "short_circuits": r.short_circuits,
+                "retry_in_seconds": int(r.blocked_until - now),
+            }
+            for r in blocked
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "tracked": len(self._records),
+            "blocked": sum(1 for r in self._records.values() if r.blocked_until > now),
+            "short_circuits": self.short_circuits,
+        }
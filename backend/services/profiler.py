@@ -0,0 +1,253 @@
+"""Opt-in per-request profiling with flame-graph compatible output."""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import random
+import re
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import logging
+logger = logging.getLogger(__name__)
+
+_current_profile: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "current_profile", default=None
+)
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{16}$")
+
+
+def mark_phase(phase: str) -> None:
+    """Start a new phase on the active request profile; a no-op when not profiling."""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.mark(phase)
+
+
+def detach_profile() -> None:
+    """
+    Stop the current task reporting to a request profile it inherited.
+
+    Long-lived tasks created during a profiled request copy its context, and
+    their phases would otherwise be attributed to that request.
+    """
+    _current_profile.set(None)
+
+
+class RequestProfile:
+    """
+    Wall-clock stack samples and per-phase timings for one request.
+
+    A background thread samples the event loop thread's stack every
+    `interval` seconds, so time spent awaiting the LLM shows up as idle loop
+    frames under the active phase. Stacks are written in the folded format
+    read by flamegraph.pl and speedscope, with the phase as the root frame.
+    Other requests running on the same loop at the same time can appear in
+    the samples.
+    """
+
+    def __init__(self, profile_id: str, label: str, interval: float) -> None:
+        self.id = profile_id
+        self.label = label
+        self.interval = interval
+        self.started_at = time.time()
+        self.phases: List[Dict[str, Any]] = []
+        self.stacks: Counter = Counter()
+        self._phase: Optional[str] = None
+        self._phase_wall = 0.0
+        self._phase_cpu = 0.0
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self, phase: str) -> None:
+        self.mark(phase)
+        self._sampler = threading.Thread(target=self._sample, name=f"profile-{self.id}", daemon=True)
+        self._sampler.start()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def mark(self, phase: str) -> None:
+        if self.stopped:
+            # A task spawned during the request outlived it without detach_profile().
+            return
+        now_wall = time.perf_counter()
+        now_cpu = time.thread_time()
+        self._close_phase(now_wall, now_cpu)
+        self._phase = phase
+        self._phase_wall = now_wall
+        self._phase_cpu = now_cpu
+
+    def stop(self) -> None:
+        self._close_phase(time.perf_counter(), time.thread_time())
+        self._phase = None
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join(timeout=1.0)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "started_at": self.started_at,
+            "wall_ms": round(sum(p["wall_ms"] for p in self.phases), 3),
+            "cpu_ms": round(sum(p["cpu_ms"] for p in self.phases), 3),
+            "samples": sum(self.stacks.values()),
+            "sample_interval_ms": self.interval * 1000,
+            "phases": self.phases,
+        }
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def _close_phase(self, now_wall: float, now_cpu: float) -> None:
+        if self._phase is None:
+            return
+        self.phases.append({
+            "phase": self._phase,
+            "wall_ms": round((now_wall - self._phase_wall) * 1000, 3),
+            "cpu_ms": round((now_cpu - self._phase_cpu) * 1000, 3),
+        })
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            phase = self._phase
+            if frame is None or phase is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                frame = frame.f_back
+            names.append(f"phase:{phase}")
+            self.stacks[";".join(reversed(names))] += 1
+
+
+class RequestProfiler:
+    """
+    Decides which requests to profile and stores their output on local disk.
+
+    Profiling is off unless `PROFILE_SAMPLE_RATE` is above zero or a caller
+    sends `X-Profile: 1` together with a valid admin token. Each profile is
+    written as `<id>.folded` (flame graph stacks) and `<id>.json` (phase
+    timings); only the newest `max_files` profiles are kept.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        sample_rate: Optional[float] = None,
+        interval_seconds: Optional[float] = None,
+        max_files: Optional[int] = None,
+        is_admin: Optional[Callable[[Optional[str]], bool]] = None
+    ) -> None:
+        if directory is None:
+            directory = os.getenv("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "name-analyser-profiles")
+        if sample_rate is None:
+            sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+        if interval_seconds is None:
+            interval_seconds = float(os.getenv("PROFILE_INTERVAL_MS", "2")) / 1000
+        if max_files is None:
+            max_files = int(os.getenv("PROFILE_MAX_FILES", "100"))
+        self.directory = Path(directory)
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.interval_seconds = max(interval_seconds, 0.0005)
+        self.max_files = max(max_files, 1)
+        self.is_admin = is_admin or (lambda token: False)
+
+    def should_profile(self, headers: Dict[str, str]) -> bool:
+        if headers.get("x-profile") == "1" and self.is_admin(headers.get("x-admin-token")):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def begin(self, label: str, phase: str) -> RequestProfile:
+        profile = RequestProfile(secrets.token_hex(8), label, self.interval_seconds)
+        profile.start(phase)
+        return profile
+
+    def finish(self, profile: RequestProfile) -> None:
+        profile.stop()
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / f"{profile.id}.folded").write_text(profile.folded(), encoding="utf-8")
+            (self.directory / f"{profile.id}.json").write_text(json.dumps(profile.summary()), encoding="utf-8")
+            self._prune()
+        except OSError as exc:
+            logger.warning("Could not write profile %s: %s", profile.id, exc)
+
+    def list(self) -> List[Dict[str, Any]]:
+        if not self.directory.exists():
+            return []
+        summaries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                summaries.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+        summaries.sort(key=lambda s: s.get("started_at", 0), reverse=True)
+        return summaries
+
+    def path_for(self, profile_id: str, kind: str) -> Optional[Path]:
+        if not PROFILE_ID_PATTERN.match(profile_id) or kind not in ("folded", "json"):
+            return None
+        path = self.directory / f"{profile_id}.{kind}"
+        return path if path.exists() else None
+
+    def _prune(self) -> None:
+        summaries = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for path in summaries[self.max_files:]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".folded").unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles selected HTTP requests under `path_prefix`.
+
+    The request body read and validation count as the `validation` phase;
+    handlers mark later phases with `mark_phase`. The profile id is returned
+    in the `X-Profile-Id` response header.
+    """
+
+    def __init__(self, app: Any, profiler: RequestProfiler, path_prefix: str = "/api/analyse") -> None:
+        self.app = app
+        self.profiler = profiler
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        if not self.profiler.should_profile(headers):
+            await self.app(scope, receive, send)
+            return
+
+        profile = self.profiler.begin(f"{scope['method']} {scope['path']}", "validation")
+        token = _current_profile.set(profile)
+
+        async def send_with_profile_id(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-profile-id", profile.id.encode("latin-1"))]
+                profile.mark("send")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            _current_profile.reset(token)
+            self.profiler.finish(profile)
@@ -0,0 +1,273 @@
+"""Ceremony live-reading sessions with look-ahead prefetch of an ordered roster."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import secrets
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+import logging
+logger = logging.getLogger(__name__)
+
+from .llm_scheduler import PRIORITY_BATCH, PRIORITY_INTERACTIVE
+
+# (name, priority, batch_id) -> response payload
+Resolver = Callable[[str, str, Optional[str]], Awaitable[Dict[str, Any]]]
+
+
+class CursorRateLimited(RuntimeError):
+    """Raised when a session moves its cursor faster than its move budget."""
+
+
+class ReadingSession:
+    """
+    An ordered roster being read aloud, with a cursor on the current graduate.
+
+    Results for the current name and the next `lookahead` names are fetched
+    ahead of the cursor and pinned in the session, independently of the
+    shared result cache, so advancing never waits on the upstream LLM. Only
+    the name under the cursor is fetched at interactive priority; the rest of
+    the window at batch priority, shared fairly with other sessions. Cursor
+    moves are limited to `max_moves_per_minute` so seeking through a long
+    roster cannot flood the upstream LLM. Results that come back as fallback
+    output are retried while still ahead of the cursor. Subscribers receive
+    every state change as an event dict.
+
+    The session id is the only credential for the session, so upstream work
+    runs under `job_id`, a digest of it that is safe to show in metrics.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        names: List[str],
+        resolver: Resolver,
+        lookahead: int = 5,
+        keep_behind: int = 1,
+        fallback_retries: int = 1,
+        retry_delay_seconds: float = 5.0,
+        max_moves_per_minute: int = 60
+    ) -> None:
+        self.id = session_id
+        self.job_id = f"session-{hashlib.sha256(session_id.encode('utf-8')).hexdigest()[:8]}"
+        self.names = names
+        self.resolver = resolver
+        self.lookahead = max(lookahead, 0)
+        self.keep_behind = max(keep_behind, 0)
+        self.fallback_retries = max(fallback_retries, 0)
+        self.retry_delay_seconds = retry_delay_seconds
+        self.max_moves_per_minute = max(max_moves_per_minute, 1)
+        self.cursor = 0
+        self.created_at = time.time()
+        self.last_active = self.created_at
+
+        self._results: Dict[int, Dict[str, Any]] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._attempts: Dict[int, int] = {}
+        self._listeners: Set[asyncio.Queue] = set()
+        self._moves: Deque[float] = deque()
+
+    @property
+    def total(self) -> int:
+        return len(self.names)
+
+    def start(self) -> None:
+        self._prefetch()
+
+    def move(self, index: int) -> None:
+        """Move the cursor, evicting results behind it and prefetching ahead of it."""
+        now = time.monotonic()
+        while self._moves and now - self._moves[0] >= 60:
+            self._moves.popleft()
+        if len(self._moves) >= self.max_moves_per_minute:
+            raise CursorRateLimited(f"Cursor moves are limited to {self.max_moves_per_minute} per minute")
+        self._moves.append(now)
+
+        self.cursor = min(max(index, 0), max(self.total - 1, 0))
+        self.last_active = time.time()
+        self._evict()
+        self._prefetch()
+        self._publish({"type": "cursor", **self.snapshot()})
+
+    def advance(self, step: int = 1) -> None:
+        self.move(self.cursor + step)
+
+    async def current(self) -> Optional[Dict[str, Any]]:
+        """Result for the name under the cursor, waiting for it if it is still in flight."""
+        index = self.cursor
+        if index in self._results:
+            return self._results[index]
+        task = self._tasks.get(index) or self._fetch(index)
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Only our wait was cancelled; leave the shared fetch running.
+            raise
+        except Exception:
+            pass
+        return self._results.get(index)
+
+    def result(self, index: int) -> Optional[Dict[str, Any]]:
+        """Pinned result for a roster index, if the session holds one."""
+        return self._results.get(index)
+
+    def ready(self) -> Dict[int, Dict[str, Any]]:
+        """Pinned results currently held by the session, by roster index."""
+        return dict(self._results)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.id,
+            "cursor": self.cursor,
+            "total": self.total,
+            "lookahead": self.lookahead,
+            "current_name": self.names[self.cursor] if self.names else None,
+            "ready": sorted(self._results),
+            "pending": sorted(self._tasks),
+        }
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._listeners.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._listeners.discard(queue)
+
+    async def close(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._publish({"type": "closed", "session_id": self.id})
+
+    def _window(self) -> range:
+        return range(self.cursor, min(self.cursor + self.lookahead + 1, self.total))
+
+    def _prefetch(self) -> None:
+        for index in self._window():
+            if index not in self._results and index not in self._tasks:
+                self._fetch(index)
+
+    def _evict(self) -> None:
+        low = self.cursor - self.keep_behind
+        high = self.cursor + self.lookahead
+        for index in [i for i in self._results if i < low or i > high]:
+            del self._results[index]
+            self._attempts.pop(index, None)
+        for index in [i for i in self._tasks if i < self.cursor or i > high]:
+            self._tasks.pop(index).cancel()
+
+    def _fetch(self, index: int, delay: float = 0.0) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(self._load(index, delay))
+        self._tasks[index] = task
+        return task
+
+    async def _load(self, index: int, delay: float) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        priority = PRIORITY_INTERACTIVE if index == self.cursor else PRIORITY_BATCH
+        try:
+            result = await self.resolver(self.names[index], priority, self.job_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("Prefetch failed for session %s index %s: %s", self.job_id, index, exc)
+            return
+        finally:
+            if self._tasks.get(index) is asyncio.current_task():
+                del self._tasks[index]
+
+        if index < self.cursor - self.keep_behind or index > self.cursor + self.lookahead:
+            return
+
+        self._results[index] = result
+        self._publish({"type": "result", "index": index, "result": result})
+
+        attempts = self._attempts.get(index, 0)
+        if result.get("quality") == "fallback" and index > self.cursor and attempts < self.fallback_retries:
+            self._attempts[index] = attempts + 1
+            self._fetch(index, delay=self.retry_delay_seconds)
+
+    def _publish(self, event: Dict[str, Any]) -> None:
+        for queue in list(self._listeners):
+            queue.put_nowait(event)
+
+
+class ReadingSessionManager:
+    """Creates, looks up and expires reading sessions held in memory."""
+
+    def __init__(
+        self,
+        resolver: Resolver,
+        max_sessions: Optional[int] = None,
+        idle_ttl_seconds: Optional[float] = None,
+        default_lookahead: Optional[int] = None,
+        moves_per_minute: Optional[int] = None
+    ) -> None:
+        if max_sessions is None:
+            max_sessions = int(os.getenv("READING_SESSION_MAX_ACTIVE", "50"))
+        if idle_ttl_seconds is None:
+            idle_ttl_seconds = float(os.getenv("READING_SESSION_IDLE_TTL_SECONDS", "14400"))
+        if default_lookahead is None:
+            default_lookahead = int(os.getenv("READING_SESSION_LOOKAHEAD", "5"))
+        if moves_per_minute is None:
+            moves_per_minute = int(os.getenv("READING_SESSION_MOVES_PER_MINUTE", "60"))
+        self.resolver = resolver
+        self.max_sessions = max(max_sessions, 1)
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.default_lookahead = default_lookahead
+        self.moves_per_minute = moves_per_minute
+        self._sessions: Dict[str, ReadingSession] = {}
+
+    async def create(self, names: List[str], lookahead: Optional[int] = None) -> ReadingSession:
+        await self._expire_idle()
+        if len(self._sessions) >= self.max_sessions:
+            raise RuntimeError("Too many active reading sessions")
+
+        session = ReadingSession(
+            session_id=secrets.token_urlsafe(12),
+            names=names,
+            resolver=self.resolver,
+            lookahead=self.default_lookahead if lookahead is None else lookahead,
+            max_moves_per_minute=self.moves_per_minute
+        )
+        self._sessions[session.id] = session
+        session.start()
+        logger.info("Started reading session %s with %s names", session.job_id, session.total)
+        return session
+
+    def get(self, session_id: str) -> Optional[ReadingSession]:
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_active = time.time()
+        return session
+
+    async def close(self, session_id: str) -> bool:
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        await session.close()
+        return True
+
+    async def close_all(self) -> None:
+        for session_id in list(self._sessions):
+            await self.close(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "pinned_results": sum(len(s.ready()) for s in self._sessions.values()),
+        }
+
+    async def _expire_idle(self) -> None:
+        cutoff = time.time() - self.idle_ttl_seconds
+        for session_id in [sid for sid, s in self._sessions.items() if s.last_active < cutoff]:
+            logger.info("Expiring idle reading session %s", self._sessions[session_id].job_id)
+            await self.close(session_id)
@@ -0,0 +1,223 @@
+"""In-memory result cache with versioned entries and optional JSON persistence."""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import logging
+logger = logging.getLogger(__name__)
+
+from .serialisation import dumps_json, loads_json
+
+ARTIFACT_FORMAT = 1
+
+
+@dataclass
+class CacheEntry:
+    name: str
+    output: Dict[str, Any]
+    version: str
+    stored_at: float
+
+
+class ResultCache:
+    """
+    LRU cache of analysis outputs keyed by canonical name key.
+
+    Every entry records the analysis version (model and prompt) that produced
+    it so callers can tell fresh results from ones that need revalidation.
+
+    A precomputed roster artifact can be loaded as a second, read-only tier:
+    its entries are never evicted, and newer results stored for the same key
+    take precedence over them.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        path: Optional[str] = None,
+        artifact_path: Optional[str] = None
+    ) -> None:
+        if max_entries is None:
+            max_entries = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "20000"))
+        if path is None:
+            path = os.getenv("RESULT_CACHE_PATH") or None
+        if artifact_path is None:
+            artifact_path = os.getenv("WARM_CACHE_ARTIFACT") or None
+        self.max_entries = max(max_entries, 1)
+        self.path = Path(path) if path else None
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._pinned: Dict[str, CacheEntry] = {}
+        # Key schemes of `_entries` and `_pinned`; None when unknown (e.g. a file from before schemes).
+        self.key_scheme: Optional[str] = None
+        self.pinned_key_scheme: Optional[str] = None
+        self._key: Optional[Callable[[str], str]] = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+        if self.path and self.path.exists():
+            self.load()
+        if artifact_path:
+            self.load_artifact(artifact_path)
+
+    def __len__(self) -> int:
+        return len(self._entries) + sum(1 for key in self._pinned if key not in self._entries)
+
+    def get(self, key: str, version: Optional[str] = None) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        else:
+            entry = self._pinned.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if version is not None and entry.version != version:
+            self.stale_hits += 1
+        return entry
+
+    def put(self, key: str, name: str, output: Dict[str, Any], version: str) -> None:
+        self._entries[key] = CacheEntry(name=name, output=output, version=version, stored_at=time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stale_names(self, version: str) -> List[str]:
+        """Names whose cached result was produced by a different analysis version."""
+        return [entry.name for entry in self._iter_entries() if entry.version != version]
+
+    def load_artifact(self, path: str) -> int:
+        """Load a read-only warm cache artifact written by `write_artifact`."""
+        artifact = Path(path)
+        try:
+            with artifact.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                payload = loads_json(memoryview(mapped))
+        except (OSError, ValueError) as exc:
+            logger.error("Could not load warm cache artifact %s: %s", artifact, exc)
+            return 0
+
+        if payload.get("format") != ARTIFACT_FORMAT:
+            logger.error("Unsupported warm cache artifact format in %s", artifact)
+            return 0
+
+        version = payload["analysis_version"]
+        created_at = payload.get("created_at", 0.0)
+        entries = payload.get("entries", {})
+        for key, raw in entries.items():
+            self._pinned[key] = CacheEntry(name=raw["name"], output=raw["output"], version=version, stored_at=created_at)
+        self.pinned_key_scheme = payload.get("key_scheme")
+        logger.info("Loaded %s precomputed results from %s (%s)", len(entries), artifact, version)
+        if self._key is not None:
+            self.rekey(self._key, self.key_scheme)
+        return len(entries)
+
+    def load(self) -> None:
+        if not self.path:
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception as exc:
+            logger.warning("Could not load result cache from %s: %s", self.path, exc)
+            return
+        for key, raw in payload.get("entries", {}).items():
+            self._entries[key] = CacheEntry(
+                name=raw["name"],
+                output=raw["output"],
+                version=raw["version"],
+                stored_at=raw.get("stored_at", 0.0)
+            )
+        self.key_scheme = payload.get("key_scheme")
+        logger.info("Loaded %s cached results from %s", len(self._entries), self.path)
+
+    def rekey(self, key: Callable[[str], str], key_scheme: str) -> None:
+        """
+        Rebuild keys from entry names if they were written under a different key scheme.
+
+        Applies to both the persisted entries and the precomputed artifact, so
+        an artifact built with different canonicaliser flags still serves hits.
+        Artifacts loaded later are rekeyed with the same function.
+        """
+        self._key = key
+        if self.key_scheme != key_scheme and self._entries:
+            logger.info("Rekeying %s cached results from %s to %s", len(self._entries), self.key_scheme, key_scheme)
+            self._entries = self._rekeyed(self._entries, key)
+        self.key_scheme = key_scheme
+        if self.pinned_key_scheme != key_scheme and self._pinned:
+            logger.warning(
+                "Warm cache artifact keys use %s, rekeying %s results to %s",
+                self.pinned_key_scheme, len(self._pinned), key_scheme
+            )
+            self._pinned = dict(self._rekeyed(self._pinned, key))
+        self.pinned_key_scheme = key_scheme
+
+    @staticmethod
+    def _rekeyed(entries: Dict[str, CacheEntry], key: Callable[[str], str]) -> "OrderedDict[str, CacheEntry]":
+        rekeyed: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        for entry in entries.values():
+            # Oldest first, so the most recently used variant wins a collision.
+            new_key = key(entry.name)
+            rekeyed.pop(new_key, None)
+            rekeyed[new_key] = entry
+        return rekeyed
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        payload = {
+            "key_scheme": self.key_scheme,
+            "entries": {
+                key: {
+                    "name": entry.name,
+                    "output": entry.output,
+                    "version": entry.version,
+                    "stored_at": entry.stored_at,
+                }
+                for key, entry in self._entries.items()
+            }
+        }
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(self.path)
+
+    def _iter_entries(self):
+        yield from self._entries.values()
+        for key, entry in self._pinned.items():
+            if key not in self._entries:
+                yield entry
+
+    def stats(self, version: Optional[str] = None) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {
+            "entries": len(self._entries),
+            "pinned_entries": len(self._pinned),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+        if version is not None:
+            stats["stale_entries"] = sum(1 for e in self._iter_entries() if e.version != version)
+        return stats
+
+
+def write_artifact(path: str, analysis_version: str, key_scheme: str, entries: Dict[str, CacheEntry]) -> None:
+    """Write entries as a compact read-only artifact for `ResultCache.load_artifact`."""
+    payload = {
+        "format": ARTIFACT_FORMAT,
+        "analysis_version": analysis_version,
+        "key_scheme": key_scheme,
+        "created_at": time.time(),
+        "entries": {key: {"name": entry.name, "output": entry.output} for key, entry in entries.items()},
+    }
+    target = Path(path)
+    tmp_path = target.with_suffix(target.suffix + ".tmp")
+    tmp_path.write_bytes(dumps_json(payload))
+    tmp_path.replace(target)
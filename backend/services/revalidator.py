@@ -0,0 +1,146 @@
+"""Background re-analysis of stale cache entries under a rate budget."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import logging
+logger = logging.getLogger(__name__)
+
+from .profiler import detach_profile
+
+REVALIDATION_BATCH_ID = "revalidation"
+
+
+class Revalidator:
+    """
+    Queue of names to re-analyse after the model or prompt version changes.
+
+    Stale results keep being served while this runs. Work is paced to at most
+    `rate_per_minute` upstream analyses and goes through the LLM scheduler at
+    batch priority, so interactive lookups are never slowed down by a refresh.
+
+    Each run, from the first enqueue on an empty queue until the queue drains,
+    is its own job for token accounting, so LLM_JOB_TOKEN_BUDGET caps a single
+    run rather than every refresh for the life of the process.
+    """
+
+    def __init__(
+        self,
+        analysis_service: Any,
+        rate_per_minute: Optional[float] = None,
+        concurrency: Optional[int] = None
+    ) -> None:
+        if rate_per_minute is None:
+            rate_per_minute = float(os.getenv("REVALIDATE_RATE_PER_MINUTE", "30"))
+        if concurrency is None:
+            concurrency = int(os.getenv("REVALIDATE_CONCURRENCY", "2"))
+        self.analysis_service = analysis_service
+        self.rate_per_minute = max(rate_per_minute, 0.1)
+        self.concurrency = max(concurrency, 1)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: Set[str] = set()
+        self._workers: List[asyncio.Task] = []
+        self._pace_lock: Optional[asyncio.Lock] = None
+        self._next_start = 0.0
+        self._runs = 0
+        self.batch_id = REVALIDATION_BATCH_ID
+
+        self.enqueued = 0
+        self.completed = 0
+        self.failed = 0
+        self.started_at: Optional[float] = None
+
+    def enqueue(self, name: str) -> bool:
+        """Queue a name for re-analysis. Returns False if it or a variant sharing its key is queued."""
+        key = self.analysis_service.cache_key(name)
+        if key in self._pending:
+            return False
+        self._ensure_workers()
+        if not self._pending:
+            self._runs += 1
+            self.batch_id = f"{REVALIDATION_BATCH_ID}-{self._runs}"
+        self._pending.add(key)
+        self._queue.put_nowait((key, name, self.batch_id))
+        self.enqueued += 1
+        if self.started_at is None:
+            self.started_at = time.time()
+        return True
+
+    def enqueue_stale(self) -> int:
+        """Queue every cached name whose analysis version is out of date."""
+        names = self.analysis_service.cache.stale_names(self.analysis_service.analysis_version)
+        return sum(1 for name in names if self.enqueue(name))
+
+    async def drain(self) -> None:
+        """Wait until every queued name has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def progress(self) -> Dict[str, Any]:
+        processed = self.completed + self.failed
+        remaining = len(self._pending)
+        elapsed = time.time() - self.started_at if self.started_at else 0.0
+        rate = processed / elapsed * 60 if elapsed > 0 else 0.0
+        effective_rate = min(rate, self.rate_per_minute) if rate else self.rate_per_minute
+        return {
+            "job": self.batch_id if self._runs else None,
+            "enqueued": self.enqueued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "remaining": remaining,
+            "percent_complete": round(processed / self.enqueued * 100, 1) if self.enqueued else 100.0,
+            "rate_budget_per_minute": self.rate_per_minute,
+            "observed_per_minute": round(rate, 1),
+            "eta_seconds": int(remaining / effective_rate * 60) if remaining else 0,
+        }
+
+    def _ensure_workers(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._pace_lock = asyncio.Lock()
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(asyncio.get_running_loop().create_task(self._worker()))
+
+    async def _wait_for_budget(self) -> None:
+        interval = 60.0 / self.rate_per_minute
+        async with self._pace_lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start = max(now, self._next_start) + interval
+
+    async def _worker(self) -> None:
+        # Workers are started lazily, possibly inside a profiled request.
+        detach_profile()
+        while True:
+            key, name, batch_id = await self._queue.get()
+            try:
+                await self._wait_for_budget()
+                refreshed = await self.analysis_service.refresh(
+                    name, batch_id=batch_id, endpoint="revalidation"
+                )
+                if refreshed:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.failed += 1
+                logger.warning("Revalidation failed for %s: %s", name[:50], exc)
+            finally:
+                self._pending.discard(key)
+                self._queue.task_done()
@@ -0,0 +1,62 @@
+"""Fast JSON encoding and a cache of pre-serialised response payloads."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Hashable, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    # Shared read-only mappings (e.g. language info) are encoded as plain objects.
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_json(payload: Any) -> bytes:
+    """Encode a payload as compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def loads_json(data: Any) -> Any:
+    """Decode JSON from bytes, str or a buffer such as a memoryview over an mmap."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+class PayloadCache:
+    """LRU of encoded response bodies, so repeat cache hits skip serialisation entirely."""
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        if max_entries is None:
+            max_entries = int(os.getenv("PAYLOAD_CACHE_MAX_ENTRIES", "5000"))
+        self.max_entries = max(max_entries, 1)
+        self._payloads: "OrderedDict[Hashable, bytes]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        payload = self._payloads.get(key)
+        if payload is not None:
+            self._payloads.move_to_end(key)
+        return payload
+
+    def put(self, key: Hashable, payload: bytes) -> None:
+        self._payloads[key] = payload
+        self._payloads.move_to_end(key)
+        while len(self._payloads) > self.max_entries:
+            self._payloads.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._payloads)
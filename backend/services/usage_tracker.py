@@ -0,0 +1,177 @@
+"""Token usage and cost accounting for upstream LLM calls, with token budgets."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set, Tuple
+
+import logging
+logger = logging.getLogger(__name__)
+
+# List prices in USD per million (input, output) tokens; override with LLM_PRICING.
+DEFAULT_PRICING: Dict[str, Tuple[float, float]] = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gemini-2.5-pro": (1.25, 10.00),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+}
+
+
+@dataclass
+class TokenUsage:
+    """Tokens reported by the provider for one upstream call."""
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+
+@dataclass
+class UsageTally:
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    wasted_calls: int = 0
+    wasted_tokens: int = 0
+    wasted_cost_usd: float = 0.0
+    unpriced_models: Set[str] = field(default_factory=set)
+
+    def add(self, model: str, usage: TokenUsage, cost: Optional[float], wasted: bool) -> None:
+        self.calls += 1
+        self.input_tokens += usage.input_tokens
+        self.output_tokens += usage.output_tokens
+        if cost is None:
+            self.unpriced_models.add(model)
+            cost = 0.0
+        self.cost_usd += cost
+        if wasted:
+            self.wasted_calls += 1
+            self.wasted_tokens += usage.total
+            self.wasted_cost_usd += cost
+
+    def as_dict(self) -> Dict[str, Any]:
+        total = self.input_tokens + self.output_tokens
+        stats: Dict[str, Any] = {
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": total,
+            "cost_usd": round(self.cost_usd, 6),
+            "wasted_calls": self.wasted_calls,
+            "wasted_tokens": self.wasted_tokens,
+            "wasted_cost_usd": round(self.wasted_cost_usd, 6),
+            "wasted_token_share": round(self.wasted_tokens / total, 4) if total else 0.0,
+        }
+        if self.unpriced_models:
+            stats["unpriced_models"] = sorted(self.unpriced_models)
+        return stats
+
+
+class UsageTracker:
+    """
+    Aggregates provider-reported token usage per model, endpoint and job.
+
+    Calls whose output failed the quality gate (or errored) are counted as
+    wasted, so the metrics show how many tokens retries cost. A job is the
+    batch id a call ran under (precompute run, export, reading session,
+    revalidation run); interactive lookups have no job.
+
+    Budgets are checked before each attempt: once a request has spent
+    `request_budget` tokens, or its job has spent `job_budget`, no further
+    upstream calls are made for it. Zero disables a budget.
+    """
+
+    def __init__(
+        self,
+        pricing: Optional[Dict[str, Tuple[float, float]]] = None,
+        request_budget: Optional[int] = None,
+        job_budget: Optional[int] = None,
+        max_jobs: int = 500
+    ) -> None:
+        if pricing is None:
+            pricing = dict(DEFAULT_PRICING)
+            overrides = os.getenv("LLM_PRICING")
+            if overrides:
+                try:
+                    pricing.update({model: tuple(prices) for model, prices in json.loads(overrides).items()})
+                except (ValueError, TypeError, AttributeError) as exc:
+                    logger.error("Ignoring invalid LLM_PRICING: %s", exc)
+        if request_budget is None:
+            request_budget = int(os.getenv("LLM_REQUEST_TOKEN_BUDGET", "0"))
+        if job_budget is None:
+            job_budget = int(os.getenv("LLM_JOB_TOKEN_BUDGET", "0"))
+        self.pricing = pricing
+        self.request_budget = max(request_budget, 0)
+        self.job_budget = max(job_budget, 0)
+        self.max_jobs = max(max_jobs, 1)
+        self.total = UsageTally()
+        self._by_model: Dict[str, UsageTally] = {}
+        self._by_endpoint: Dict[str, UsageTally] = {}
+        self._by_job: "OrderedDict[str, UsageTally]" = OrderedDict()
+        self.budget_stops = {"request": 0, "job": 0}
+
+    def cost(self, model: str, usage: TokenUsage) -> Optional[float]:
+        prices = self.pricing.get(model)
+        if prices is None:
+            return None
+        input_price, output_price = prices
+        return (usage.input_tokens * input_price + usage.output_tokens * output_price) / 1_000_000
+
+    def record(
+        self,
+        model: str,
+        usage: TokenUsage,
+        endpoint: Optional[str] = None,
+        job: Optional[str] = None,
+        wasted: bool = False
+    ) -> None:
+        cost = self.cost(model, usage)
+        self.total.add(model, usage, cost, wasted)
+        self._by_model.setdefault(model, UsageTally()).add(model, usage, cost, wasted)
+        self._by_endpoint.setdefault(endpoint or "unspecified", UsageTally()).add(model, usage, cost, wasted)
+        if job:
+            tally = self._by_job.get(job)
+            if tally is None:
+                tally = self._by_job[job] = UsageTally()
+            self._by_job.move_to_end(job)
+            tally.add(model, usage, cost, wasted)
+            while len(self._by_job) > self.max_jobs:
+                self._by_job.popitem(last=False)
+
+    def budget_exceeded(self, request_tokens: int, job: Optional[str] = None) -> Optional[str]:
+        """Reason to stop calling upstream for this request, or None while within budget."""
+        if self.request_budget and request_tokens >= self.request_budget:
+            self.budget_stops["request"] += 1
+            return f"Request token budget of {self.request_budget} reached"
+        if self.job_budget and job:
+            tally = self._by_job.get(job)
+            if tally is not None and tally.input_tokens + tally.output_tokens >= self.job_budget:
+                self.budget_stops["job"] += 1
+                return f"Job token budget of {self.job_budget} reached"
+        return None
+
+    def job_usage(self, job: str) -> Optional[Dict[str, Any]]:
+        tally = self._by_job.get(job)
+        return tally.as_dict() if tally is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "total": self.total.as_dict(),
+            "by_model": {model: tally.as_dict() for model, tally in self._by_model.items()},
+            "by_endpoint": {endpoint: tally.as_dict() for endpoint, tally in self._by_endpoint.items()},
+            # Most recently active jobs first
+            "by_job": {job: tally.as_dict() for job, tally in reversed(self._by_job.items())},
+            "budgets": {
+                "request_tokens": self.request_budget or None,
+                "job_tokens": self.job_budget or None,
+                "stops": dict(self.budget_stops),
+            },
+        }